@@ -1,11 +1,90 @@
 """Core functionality for Advent of Code."""
 
-from collections.abc import Iterable, Iterator
-from itertools import tee
-from typing import Annotated, Literal, Protocol
+from pathlib import Path
+from typing import TYPE_CHECKING, Annotated, Literal, Protocol, TextIO
 
 from pydantic import Field
 
+from aoc_core.cache import (
+    INT_TYPECODE,
+    Codec,
+    ParseCache,
+    load_cached,
+    pack_ints,
+    pack_ragged,
+    unpack_ints,
+    unpack_ragged,
+    use_cache,
+)
+from aoc_core.engines import DEFAULT_ENGINE, EngineNotFoundError, select_engine, use_engine
+from aoc_core.external import SortedRuns
+from aoc_core.generate import DEFAULT_SEED, generate_input, random_grid_rows, write_lines
+from aoc_core.grid import DIRECTIONS, NEIGHBOURS, Grid, Offset
+from aoc_core.inputs import STDIN, InputBuffer, open_input, package_input
+from aoc_core.profiling import measure, record, span, tally
+from aoc_core.registry import (
+    DayNotFoundError,
+    available_days,
+    available_engines,
+    load_generator,
+    load_runner,
+    profile_imports,
+)
+from aoc_core.results import PartName, Result, solve
+from aoc_core.windows import differences, pairwise, windows
+
+if TYPE_CHECKING:
+    from random import Random
+
+__all__ = [
+    "DEFAULT_ENGINE",
+    "DEFAULT_SEED",
+    "DIRECTIONS",
+    "INT_TYPECODE",
+    "NEIGHBOURS",
+    "STDIN",
+    "Codec",
+    "Day",
+    "DayNotFoundError",
+    "EngineNotFoundError",
+    "Generator",
+    "Grid",
+    "InputBuffer",
+    "Offset",
+    "ParseCache",
+    "Part",
+    "PartName",
+    "Result",
+    "Runner",
+    "SortedRuns",
+    "available_days",
+    "available_engines",
+    "differences",
+    "generate_input",
+    "load_cached",
+    "load_generator",
+    "load_runner",
+    "measure",
+    "open_input",
+    "pack_ints",
+    "pack_ragged",
+    "package_input",
+    "pairwise",
+    "profile_imports",
+    "random_grid_rows",
+    "record",
+    "select_engine",
+    "solve",
+    "span",
+    "tally",
+    "unpack_ints",
+    "unpack_ragged",
+    "use_cache",
+    "use_engine",
+    "windows",
+    "write_lines",
+]
+
 Day = Annotated[int, Field(ge=1, lt=25)]
 Part = Literal["one", "two", "both"]
 
@@ -14,18 +93,13 @@ class Runner(Protocol):
     """A function to run the Advent of Code solution for a given day."""
 
     @staticmethod
-    def __call__(part: Part, *, test: bool = False) -> None: ...  # noqa: D102
+    def __call__(  # noqa: D102
+        part: Part, *, test: bool = False, input_path: Path | None = None
+    ) -> list[Result]: ...
 
 
-def pairwise[T](iterable: Iterable[T]) -> Iterator[tuple[T, T]]:
-    """
-    Iterate over an iterable pairwise, returning the value and the
-    next value in a tuple.
+class Generator(Protocol):
+    """A function to write a synthetic input of a given size for a day."""
 
-    """
-    current_iter, next_iter = tee(iter(iterable))
-    try:
-        next(next_iter)
-    except StopIteration:
-        return iter([])
-    return zip(current_iter, next_iter, strict=False)
+    @staticmethod
+    def __call__(file: TextIO, size: int, rng: "Random") -> None: ...  # noqa: D102
@@ -0,0 +1,73 @@
+"""Running many days' solutions concurrently on a process pool."""
+
+from collections.abc import Iterator, Sequence
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from contextlib import ExitStack
+from functools import partial
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import TYPE_CHECKING
+
+from aoc_core.cache import ParseCache, use_cache
+from aoc_core.engines import DEFAULT_ENGINE, use_engine
+from aoc_core.registry import load_runner
+
+if TYPE_CHECKING:
+    from aoc_core import Day, Part, PartName, Result
+
+type _Job = tuple["Day", "PartName"]
+
+
+def _run_part(
+    day: "Day", part: "PartName", *, test: bool, cache: ParseCache, engine: str
+) -> list["Result"]:
+    """Run a single part of a day in a worker, sharing parsed inputs through the cache."""
+    with use_cache(cache), use_engine(engine):
+        return load_runner(day)(part, test=test)
+
+
+def run_days(
+    days: Sequence["Day"],
+    part: "Part" = "both",
+    *,
+    test: bool = False,
+    cache: ParseCache | None = None,
+    engine: str = DEFAULT_ENGINE,
+    max_workers: int | None = None,
+) -> Iterator["Result"]:
+    """
+    Run the parts of many days concurrently on a process pool, yielding
+    results in order of day and part as soon as each is available.
+
+    Every part runs as its own job. A day's second part is only started
+    once its first part has finished, so that it can load the input the
+    first part parsed from the cache rather than parsing it again. If no
+    cache is given, a temporary one is used for the run.
+
+    """
+    parts: tuple[PartName, ...] = ("one", "two") if part == "both" else (part,)
+    order = [(day, day_part) for day in days for day_part in parts]
+
+    with ExitStack() as stack:
+        if cache is None:
+            cache = ParseCache(Path(stack.enter_context(TemporaryDirectory(prefix="aoc-"))))
+        pool = stack.enter_context(ProcessPoolExecutor(max_workers=max_workers))
+        run_part = partial(_run_part, test=test, cache=cache, engine=engine)
+
+        pending: dict[Future[list[Result]], _Job] = {
+            pool.submit(run_part, day, parts[0]): (day, parts[0]) for day in days
+        }
+        finished: dict[_Job, list[Result]] = {}
+        next_index = 0
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                day, day_part = job = pending.pop(future)
+                finished[job] = future.result()
+                if day_part != parts[-1]:
+                    next_job = (day, parts[parts.index(day_part) + 1])
+                    pending[pool.submit(run_part, *next_job)] = next_job
+
+            while next_index < len(order) and order[next_index] in finished:
+                yield from finished.pop(order[next_index])
+                next_index += 1
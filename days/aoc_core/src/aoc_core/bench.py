@@ -0,0 +1,154 @@
+"""In-process benchmarking of Advent of Code solutions."""
+
+import json
+import statistics
+import sys
+import tracemalloc
+from collections import defaultdict
+from collections.abc import Iterable
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, TextIO
+
+from aoc_core.profiling import record
+from aoc_core.registry import load_runner
+
+if TYPE_CHECKING:
+    from aoc_core import Day, Part, Runner
+
+
+@dataclass(frozen=True, slots=True)
+class PhaseStats:
+    """Timing statistics for a single phase of a day's solution."""
+
+    day: "Day"
+    phase: str
+    """The phase, such as 'load', 'part one' or 'part two/patrol'."""
+    runs: int
+    min: float
+    """The fastest run, in seconds."""
+    median: float
+    """The median run, in seconds."""
+    p95: float
+    """The 95th percentile run, in seconds."""
+    peak_memory: int | None
+    """The peak memory allocated by the phase, in bytes."""
+
+
+def _percentile(samples: list[float], percentile: int) -> float:
+    """Get a percentile of some samples, interpolating between them."""
+    if len(samples) == 1:
+        return samples[0]
+    return statistics.quantiles(samples, n=100, method="inclusive")[percentile - 1]
+
+
+def _phase_totals(
+    runner: "Runner", part: "Part", *, test: bool, input_path: Path | None
+) -> dict[str, tuple[float, int]]:
+    """Run a day once, totalling the elapsed time and peak memory of each phase."""
+    with record() as recorder:
+        runner(part, test=test, input_path=input_path)
+
+    totals: dict[str, tuple[float, int]] = {}
+    for span in recorder.spans:
+        elapsed, peak_memory = totals.get(span.path, (0.0, 0))
+        totals[span.path] = (elapsed + span.elapsed, max(peak_memory, span.peak_memory or 0))
+    return totals
+
+
+def benchmark(
+    day: "Day",
+    part: "Part" = "both",
+    *,
+    repeat: int = 5,
+    warmup: int = 1,
+    test: bool = False,
+    input_path: Path | None = None,
+) -> list[PhaseStats]:
+    """
+    Benchmark a day's solution in-process, timing its phases separately.
+
+    The timed runs are made without tracing memory, and one extra run is
+    made with `tracemalloc` to record the peak memory of each phase.
+
+    """
+    runner = load_runner(day)
+    for _ in range(warmup):
+        runner(part, test=test, input_path=input_path)
+
+    samples: dict[str, list[float]] = defaultdict(list)
+    for _ in range(repeat):
+        for phase, (elapsed, _) in _phase_totals(
+            runner, part, test=test, input_path=input_path
+        ).items():
+            samples[phase].append(elapsed)
+
+    already_tracing = tracemalloc.is_tracing()
+    if not already_tracing:
+        tracemalloc.start()
+    try:
+        traced = _phase_totals(runner, part, test=test, input_path=input_path)
+    finally:
+        if not already_tracing:
+            tracemalloc.stop()
+
+    return [
+        PhaseStats(
+            day=day,
+            phase=phase,
+            runs=len(phase_samples),
+            min=min(phase_samples),
+            median=statistics.median(phase_samples),
+            p95=_percentile(phase_samples, 95),
+            peak_memory=traced[phase][1] if phase in traced else None,
+        )
+        for phase, phase_samples in samples.items()
+    ]
+
+
+def _format_seconds(seconds: float) -> str:
+    """Format a duration with a sensible unit."""
+    for unit, scale in (("s", 1.0), ("ms", 1e-3)):
+        if seconds >= scale:
+            return f"{seconds / scale:.3f} {unit}"
+    return f"{seconds * 1e6:.1f} us"
+
+
+def _format_bytes(n_bytes: int | None) -> str:
+    """Format a number of bytes with a sensible unit."""
+    if n_bytes is None:
+        return "-"
+    size = float(n_bytes)
+    for unit in ("B", "KiB", "MiB"):
+        if size < 1024:  # noqa: PLR2004
+            return f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GiB"
+
+
+def write_table(stats: Iterable[PhaseStats], file: TextIO = sys.stdout) -> None:
+    """Write benchmark statistics as a table."""
+    header = ("day", "phase", "runs", "min", "median", "p95", "peak memory")
+    rows = [
+        (
+            str(stat.day),
+            stat.phase,
+            str(stat.runs),
+            _format_seconds(stat.min),
+            _format_seconds(stat.median),
+            _format_seconds(stat.p95),
+            _format_bytes(stat.peak_memory),
+        )
+        for stat in stats
+    ]
+    widths = [max(map(len, column)) for column in zip(header, *rows, strict=True)]
+    for row in (header, *rows):
+        print(
+            "  ".join(cell.rjust(width) for cell, width in zip(row, widths, strict=True)), file=file
+        )
+
+
+def write_json(stats: Iterable[PhaseStats], file: TextIO = sys.stdout) -> None:
+    """Write benchmark statistics as JSON."""
+    json.dump([asdict(stat) for stat in stats], file, indent=2)
+    print(file=file)
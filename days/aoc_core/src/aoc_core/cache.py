@@ -0,0 +1,166 @@
+"""An on-disk cache of parsed inputs, keyed by the content of the input."""
+
+import marshal
+import os
+from array import array
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from contextlib import contextmanager, suppress
+from contextvars import ContextVar
+from dataclasses import dataclass
+from itertools import pairwise
+from pathlib import Path
+from typing import Any, Final
+
+from aoc_core.inputs import InputBuffer, open_input
+
+INT_TYPECODE: Final = "q"
+"""The array typecode integers are packed as."""
+DEFAULT_MAX_BYTES = 1024**3
+"""The default maximum size of the cache."""
+
+
+def default_cache_dir() -> Path:
+    """Get the default cache directory, respecting `XDG_CACHE_HOME`."""
+    cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home().joinpath(".cache")
+    return Path(cache_home).joinpath("advent-of-code-2024")
+
+
+def pack_ints(values: Iterable[int]) -> bytes:
+    """Pack integers into a compact buffer."""
+    return array(INT_TYPECODE, values).tobytes()
+
+
+def unpack_ints(data: bytes) -> list[int]:
+    """Unpack integers packed with `pack_ints`."""
+    return array(INT_TYPECODE, data).tolist()
+
+
+def pack_ragged(rows: Iterable[Sequence[int]]) -> tuple[bytes, bytes]:
+    """Pack rows of integers of varying length as flat values and row offsets."""
+    values = array(INT_TYPECODE)
+    offsets = array(INT_TYPECODE, [0])
+    for row in rows:
+        values.extend(row)
+        offsets.append(len(values))
+    return values.tobytes(), offsets.tobytes()
+
+
+def unpack_ragged(data: tuple[bytes, bytes]) -> list[list[int]]:
+    """Unpack rows of integers packed with `pack_ragged`."""
+    values, offsets = unpack_ints(data[0]), unpack_ints(data[1])
+    return [values[start:end] for start, end in pairwise(offsets)]
+
+
+@dataclass(frozen=True, slots=True)
+class Codec[T]:
+    """
+    How to convert a parsed input into values `marshal` can store, and
+    back. Bump the version whenever the encoded form or the parsed
+    structure changes, so stale entries aren't loaded.
+
+    """
+
+    encode: Callable[[T], Any]
+    decode: Callable[[Any], T]
+    version: int = 1
+
+
+class ParseCache:
+    """
+    A size-bounded cache of parsed inputs on disk, keyed by a hash of the
+    input's content. The least recently used entries are evicted first.
+
+    """
+
+    def __init__(self, directory: Path | None = None, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.directory = directory or default_cache_dir()
+        self.max_bytes = max_bytes
+
+    def entry_path(self, namespace: str, codec: Codec[Any], buffer: InputBuffer) -> Path:
+        """Get the path of the cache entry for an input, hashing its content."""
+        # Imported here so runs which don't use the cache don't pay for the import.
+        import hashlib  # noqa: PLC0415
+
+        digest = hashlib.blake2b(buffer.buffer, digest_size=16).hexdigest()
+        return self.directory.joinpath(f"{namespace}-v{codec.version}-{digest}.bin")
+
+    def get[T](self, entry_path: Path, codec: Codec[T]) -> T | None:
+        """
+        Get a parsed input from the cache, if it's present. Corrupt or
+        truncated entries are removed, and treated as missing.
+
+        """
+        try:
+            data = entry_path.read_bytes()
+        except FileNotFoundError:
+            return None
+        try:
+            parsed = codec.decode(marshal.loads(data))  # noqa: S302
+        except (EOFError, ValueError, TypeError):
+            entry_path.unlink(missing_ok=True)
+            return None
+        # Mark the entry as recently used, unless another run evicted it meanwhile.
+        with suppress(FileNotFoundError):
+            os.utime(entry_path)
+        return parsed
+
+    def put[T](self, entry_path: Path, codec: Codec[T], parsed: T) -> None:
+        """Store a parsed input in the cache, evicting old entries if it's full."""
+        # Imported here so runs which don't use the cache don't pay for the import.
+        from tempfile import NamedTemporaryFile  # noqa: PLC0415
+
+        try:
+            data = marshal.dumps(codec.encode(parsed))
+        except OverflowError:  # Too big to pack compactly, so not worth caching.
+            return
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with NamedTemporaryFile(dir=self.directory, suffix=".tmp", delete=False) as file:
+            file.write(data)
+        Path(file.name).replace(entry_path)
+        self.evict()
+
+    def evict(self) -> None:
+        """Remove the least recently used entries until the cache fits its size."""
+        entries = [(path, path.stat()) for path in self.directory.glob("*.bin")]
+        entries.sort(key=lambda entry: entry[1].st_mtime)
+        total_bytes = sum(stat.st_size for _, stat in entries)
+        for path, stat in entries:
+            if total_bytes <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total_bytes -= stat.st_size
+
+
+_CACHE: ContextVar[ParseCache | None] = ContextVar("_CACHE", default=None)
+
+
+@contextmanager
+def use_cache(cache: ParseCache) -> Iterator[ParseCache]:
+    """Use a cache for the inputs loaded within the context."""
+    token = _CACHE.set(cache)
+    try:
+        yield cache
+    finally:
+        _CACHE.reset(token)
+
+
+def load_cached[T](
+    input_path: Path, namespace: str, parse: Callable[[InputBuffer], T], codec: Codec[T]
+) -> T:
+    """
+    Open and parse an input, using the parsed input from the cache if a
+    cache is in use and the input is unchanged since it was stored.
+
+    """
+    cache = _CACHE.get()
+    with open_input(input_path) as buffer:
+        if cache is None:
+            return parse(buffer)
+
+        entry_path = cache.entry_path(namespace, codec, buffer)
+        parsed = cache.get(entry_path, codec)
+        if parsed is None:
+            parsed = parse(buffer)
+            cache.put(entry_path, codec, parsed)
+        return parsed
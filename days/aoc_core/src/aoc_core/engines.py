@@ -0,0 +1,41 @@
+"""Selection between alternative implementations of a day's solution."""
+
+from collections.abc import Iterator, Mapping
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+DEFAULT_ENGINE = "python"
+"""The engine every day has: its plain Python solution."""
+
+
+class EngineNotFoundError(LookupError):
+    """An error raised when a day has neither the engine in use nor the default engine."""
+
+
+_ENGINE: ContextVar[str] = ContextVar("_ENGINE", default=DEFAULT_ENGINE)
+
+
+@contextmanager
+def use_engine(name: str) -> Iterator[str]:
+    """Use an engine for the days run within the context which have it."""
+    token = _ENGINE.set(name)
+    try:
+        yield name
+    finally:
+        _ENGINE.reset(token)
+
+
+def select_engine[T](engines: Mapping[str, T]) -> T:
+    """
+    Pick a day's implementation for the engine in use. Days without the
+    engine use their default one, as do days with only one implementation,
+    which don't need to call this, so several days can be run with an
+    engine only some of them have.
+
+    """
+    name = _ENGINE.get()
+    for candidate in (name, DEFAULT_ENGINE):
+        if candidate in engines:
+            return engines[candidate]
+    available = ", ".join(engines)
+    raise EngineNotFoundError(f"No {name} or {DEFAULT_ENGINE} engine, only: {available}")
@@ -0,0 +1,104 @@
+"""Sorting of more integers than fit in memory, through runs spilled to disk."""
+
+import heapq
+from array import array
+from collections.abc import Iterable, Iterator
+from itertools import batched
+from pathlib import Path
+from types import TracebackType
+from typing import Self
+
+from aoc_core.cache import INT_TYPECODE
+
+READ_BLOCK_SIZE = 1 << 16
+"""The number of integers read from a run at a time while merging."""
+MAX_MERGE_RUNS = 64
+"""
+The most runs merged at once, so the open files and the blocks read from
+them stay bounded however large the input. Runs beyond this are merged
+into longer runs first.
+
+"""
+
+
+def _read_run(path: Path) -> Iterator[int]:
+    """Iterate over the integers in a run, reading them in blocks."""
+    itemsize = array(INT_TYPECODE).itemsize
+    with path.open("rb") as file:
+        while block := file.read(READ_BLOCK_SIZE * itemsize):
+            yield from array(INT_TYPECODE, block)
+
+
+class SortedRuns:
+    """
+    Integers sorted out of core. Each batch added is sorted and spilled to
+    a temporary file as a run, and iterating merges the runs, so only a
+    block of each run is in memory at once. If there are too many runs to
+    merge at once, they're first merged in groups into fewer, longer runs.
+    The files are removed when the runs are closed or garbage collected.
+
+    """
+
+    def __init__(self, directory: Path | None = None) -> None:
+        # Imported here so days which don't sort out of core don't pay for the import.
+        from tempfile import TemporaryDirectory  # noqa: PLC0415
+
+        self._directory = TemporaryDirectory(prefix="aoc-runs-", dir=directory)
+        self._runs: list[Path] = []
+        self._length = 0
+        self._n_files = 0
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __iter__(self) -> Iterator[int]:
+        while len(self._runs) > MAX_MERGE_RUNS:
+            self._merge_runs()
+        return heapq.merge(*map(_read_run, self._runs))
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def add(self, values: Iterable[int]) -> None:
+        """Sort a batch of integers and spill them to disk as a run."""
+        run = array(INT_TYPECODE, sorted(values))
+        if not run:
+            return
+        path = self._new_path()
+        with path.open("wb") as file:
+            run.tofile(file)
+        self._runs.append(path)
+        self._length += len(run)
+
+    def _new_path(self) -> Path:
+        """Get a path in the directory for a new run."""
+        self._n_files += 1
+        return Path(self._directory.name, f"{self._n_files}.bin")
+
+    def _merge_runs(self) -> None:
+        """Merge each group of `MAX_MERGE_RUNS` runs into one run, removing the merged runs."""
+        merged_runs: list[Path] = []
+        for group in batched(self._runs, MAX_MERGE_RUNS, strict=False):
+            path = self._new_path()
+            with path.open("wb") as file:
+                blocks = batched(heapq.merge(*map(_read_run, group)), READ_BLOCK_SIZE, strict=False)
+                for block in blocks:
+                    array(INT_TYPECODE, block).tofile(file)
+            for run in group:
+                run.unlink()
+            merged_runs.append(path)
+        self._runs = merged_runs
+
+    def close(self) -> None:
+        """Remove the runs from disk."""
+        self._directory.cleanup()
+        self._runs.clear()
+        self._length = 0
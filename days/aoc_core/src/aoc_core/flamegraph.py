@@ -0,0 +1,61 @@
+"""Sampling of call stacks, written in the collapsed format used to draw flamegraphs."""
+
+import signal
+from collections import Counter
+from types import FrameType, TracebackType
+from typing import TYPE_CHECKING, Self, TextIO
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+DEFAULT_INTERVAL = 0.001
+"""The CPU time between samples, in seconds."""
+
+
+def _frame_name(frame: FrameType) -> str:
+    """Name a frame by its module and qualified function name."""
+    module = frame.f_globals.get("__name__", "?")
+    return f"{module}.{frame.f_code.co_qualname}".replace(";", ":")
+
+
+class StackSampler:
+    """
+    A profiler which samples the call stack of the main thread every
+    `interval` seconds of CPU time, counting how often each stack is seen.
+    This relies on `signal.setitimer`, so isn't available on Windows.
+
+    """
+
+    def __init__(self, interval: float = DEFAULT_INTERVAL) -> None:
+        self.interval = interval
+        self.stacks: Counter[str] = Counter()
+        self._previous_handler: Callable[[int, FrameType | None], object] | int | None = None
+
+    def _sample(self, _signum: int, frame: FrameType | None) -> None:
+        """Count the stack the main thread was interrupted in."""
+        names: list[str] = []
+        while frame is not None:
+            names.append(_frame_name(frame))
+            frame = frame.f_back
+        self.stacks[";".join(reversed(names))] += 1
+
+    def __enter__(self) -> Self:
+        if not hasattr(signal, "setitimer"):
+            raise NotImplementedError("Sampling stacks is not supported on this platform")
+        self._previous_handler = signal.signal(signal.SIGPROF, self._sample)
+        signal.setitimer(signal.ITIMER_PROF, self.interval, self.interval)
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        signal.setitimer(signal.ITIMER_PROF, 0)
+        signal.signal(signal.SIGPROF, self._previous_handler)
+
+    def write_collapsed(self, file: TextIO) -> None:
+        """Write the stacks seen, one per line with their count, for `flamegraph.pl` and co."""
+        for stack, samples in sorted(self.stacks.items()):
+            print(stack, samples, file=file)
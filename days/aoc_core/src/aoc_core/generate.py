@@ -0,0 +1,49 @@
+"""Generation of large synthetic inputs for Advent of Code solutions."""
+
+from collections.abc import Iterable, Sequence
+from itertools import batched
+from typing import TYPE_CHECKING, TextIO
+
+from aoc_core.registry import load_generator
+
+if TYPE_CHECKING:
+    from random import Random
+
+    from aoc_core import Day
+
+DEFAULT_SEED = 2024
+"""The seed used for generated inputs, unless another is given."""
+LINE_BATCH_SIZE = 4096
+"""The number of lines to join before each write."""
+
+
+def write_lines(file: TextIO, lines: Iterable[str]) -> None:
+    """Write lines to a file in batches, adding a newline to each."""
+    for batch in batched(lines, LINE_BATCH_SIZE, strict=False):
+        file.write("\n".join(batch))
+        file.write("\n")
+
+
+def random_grid_rows(
+    rng: "Random", width: int, height: int, cells: Sequence[str], weights: Sequence[float]
+) -> Iterable[str]:
+    """Generate the rows of a grid of random cells, picked with some weights."""
+    for _ in range(height):
+        yield "".join(rng.choices(cells, weights, k=width))
+
+
+def generate_input(day: "Day", size: int, file: TextIO, *, seed: int = DEFAULT_SEED) -> None:
+    """
+    Generate an input for a day and write it to a file. The meaning of
+    `size` depends on the day, but the input grows linearly with it (or
+    quadratically, for days with square grids). The same seed always
+    generates the same input.
+
+    """
+    # Imported here so running a day doesn't pay for the import.
+    from random import Random  # noqa: PLC0415
+
+    if size < 1:
+        raise ValueError("`size` must be positive")
+    generator = load_generator(day)
+    generator(file, size, Random(seed))  # noqa: S311
@@ -0,0 +1,124 @@
+"""A compact grid of byte-sized cells, for the days with maps."""
+
+from collections.abc import Iterable, Iterator
+from typing import Self
+
+type Offset = tuple[int, int]
+"""A step across the grid, as the change in x and in y."""
+
+DIRECTIONS: dict[str, Offset] = {
+    "up": (0, -1),
+    "right": (1, 0),
+    "down": (0, 1),
+    "left": (-1, 0),
+}
+"""The offsets of the four directions, clockwise from up, with y increasing downwards."""
+NEIGHBOURS: tuple[Offset, ...] = (
+    (-1, -1),
+    (0, -1),
+    (1, -1),
+    (1, 0),
+    (1, 1),
+    (0, 1),
+    (-1, 1),
+    (-1, 0),
+)
+"""The offsets of the eight neighbours of a cell, clockwise from the top left."""
+
+
+class Grid:
+    """
+    A rectangular grid of byte-sized cells, stored row by row in a single
+    buffer and addressed by flat index, `y * width + x`. Editing a cell
+    makes a new grid which shares the buffer, only recording the edit.
+
+    """
+
+    __slots__ = ("_cells", "_edits", "height", "width")
+
+    def __init__(self, cells: bytes, width: int, edits: dict[int, int] | None = None) -> None:
+        if width < 1 or len(cells) % width:
+            raise ValueError("The cells must fill whole rows of a positive width")
+        self._cells = bytes(cells)
+        self._edits = edits or {}
+        self.width = width
+        self.height = len(cells) // width
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[bytes]) -> Self:
+        """Build a grid from its rows, which must all have the same width."""
+        rows = list(rows)
+        if not rows:
+            raise ValueError("A grid needs at least one row")
+        width = len(rows[0])
+        if any(len(row) != width for row in rows):
+            raise ValueError("Every row of a grid must have the same width")
+        return cls(b"".join(rows), width)
+
+    def __len__(self) -> int:
+        return len(self._cells)
+
+    def __getitem__(self, index: int) -> int:
+        if self._edits and (edit := self._edits.get(index)) is not None:
+            return edit
+        return self._cells[index]
+
+    @property
+    def cells(self) -> bytes:
+        """The cells of the grid, row by row, with any edits applied."""
+        if not self._edits:
+            return self._cells
+        cells = bytearray(self._cells)
+        for index, value in self._edits.items():
+            cells[index] = value
+        return bytes(cells)
+
+    def rows(self) -> Iterator[bytes]:
+        """Iterate over the rows of the grid, from the top."""
+        cells, width = self.cells, self.width
+        for start in range(0, len(cells), width):
+            yield cells[start : start + width]
+
+    def index(self, x: int, y: int) -> int:
+        """Get the flat index of a position."""
+        return y * self.width + x
+
+    def position(self, index: int) -> tuple[int, int]:
+        """Get the x and y of a flat index."""
+        y, x = divmod(index, self.width)
+        return x, y
+
+    def in_bounds(self, x: int, y: int) -> bool:
+        """Check whether a position is within the grid."""
+        return 0 <= x < self.width and 0 <= y < self.height
+
+    def flat_offset(self, offset: Offset) -> int:
+        """
+        Get the change in flat index of a step. Adding it to an index only
+        gives the right cell if the step doesn't cross the edge of the grid.
+
+        """
+        dx, dy = offset
+        return dy * self.width + dx
+
+    def step(self, index: int, offset: Offset) -> int | None:
+        """Step from a cell, returning the new index or `None` if it leaves the grid."""
+        y, x = divmod(index, self.width)
+        dx, dy = offset
+        if not self.in_bounds(x + dx, y + dy):
+            return None
+        return index + dy * self.width + dx
+
+    def find_all(self, value: int) -> Iterator[int]:
+        """Iterate over the indices of the cells with a value."""
+        cells, needle = self.cells, bytes((value,))
+        index = cells.find(needle)
+        while index != -1:
+            yield index
+            index = cells.find(needle, index + 1)
+
+    def with_cell(self, index: int, value: int) -> "Grid":
+        """Get a copy of the grid with one cell changed, without copying the buffer."""
+        if not 0 <= index < len(self._cells):
+            raise IndexError(f"{index} is outside the grid")
+        return Grid(self._cells, self.width, {**self._edits, index: value})
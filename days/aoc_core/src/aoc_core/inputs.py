@@ -0,0 +1,123 @@
+"""Loading of Advent of Code inputs, memory-mapped where possible."""
+
+import mmap
+import os
+import stat
+import sys
+from collections.abc import Iterator
+from contextlib import ExitStack, contextmanager
+from pathlib import Path
+
+STDIN = Path("-")
+"""The path used to request that an input is read from stdin."""
+
+
+def package_input(package_file: str, *, test: bool = False, test_name: str = "test.txt") -> Path:
+    """
+    Get the path to one of the inputs in the data directory of a day's
+    package, given the package's `__file__`.
+
+    """
+    data_root = Path(package_file).resolve().parent.joinpath("data")
+    return data_root.joinpath(test_name if test else "live.txt")
+
+
+class InputBuffer:
+    """
+    A read-only buffer over an input. Slicing the buffer only copies the
+    sliced bytes, so inputs larger than memory can be parsed line by line.
+
+    """
+
+    def __init__(self, buffer: mmap.mmap | bytes) -> None:
+        self._buffer = buffer
+
+    def __len__(self) -> int:
+        return len(self._buffer)
+
+    @property
+    def buffer(self) -> mmap.mmap | bytes:
+        """The underlying buffer, which supports `find` and `re` without copying."""
+        return self._buffer
+
+    def view(self) -> memoryview:
+        """Get a zero-copy view of the whole input."""
+        return memoryview(self._buffer)
+
+    def _line_spans(self) -> Iterator[tuple[int, int]]:
+        """Iterate over the start and end of each line in the input."""
+        buffer = self._buffer
+        end = len(buffer)
+        start = 0
+        while start < end:
+            stop = buffer.find(b"\n", start)
+            if stop == -1:
+                stop = end
+            yield start, stop
+            start = stop + 1
+
+    def lines(self) -> Iterator[bytes]:
+        """Iterate over the non-empty lines of the input, stripped of whitespace."""
+        buffer = self._buffer
+        for start, stop in self._line_spans():
+            if line := buffer[start:stop].strip():
+                yield line
+
+    def line_views(self) -> Iterator[memoryview]:
+        """Iterate over zero-copy views of each line, excluding the line ending."""
+        view = self.view()
+        for start, stop in self._line_spans():
+            line_stop = stop - 1 if stop > start and view[stop - 1] == ord("\r") else stop
+            yield view[start:line_stop]
+
+    def chunks(self, size: int) -> Iterator[bytes]:
+        """
+        Iterate over chunks of the input which end at the end of a line, each
+        a little over `size` bytes, so a large input can be processed in bulk
+        without copying all of it at once.
+
+        """
+        buffer = self._buffer
+        end = len(buffer)
+        start = 0
+        while start < end:
+            stop = buffer.find(b"\n", min(start + size, end))
+            stop = end if stop == -1 else stop + 1
+            yield buffer[start:stop]
+            start = stop
+
+    def text(self) -> str:
+        """Decode the whole input. This copies the input into memory."""
+        return self._buffer[:].decode("utf-8")
+
+
+def _map_file(fileno: int) -> mmap.mmap | bytes:
+    """Memory-map an open file, unless it's empty."""
+    if os.fstat(fileno).st_size == 0:
+        return b""
+    return mmap.mmap(fileno, 0, access=mmap.ACCESS_READ)
+
+
+@contextmanager
+def open_input(path: Path) -> Iterator[InputBuffer]:
+    """
+    Open an input, memory-mapping it where possible. If the path is `-`,
+    the input is read from stdin, which can only be memory-mapped if it's
+    redirected from a file. Views of the input must not outlive the context.
+
+    """
+    with ExitStack() as stack:
+        buffer: mmap.mmap | bytes
+        if path == STDIN:
+            stdin = sys.stdin.buffer
+            if stat.S_ISREG(os.fstat(stdin.fileno()).st_mode):
+                buffer = _map_file(stdin.fileno())
+            else:
+                buffer = stdin.read()
+        else:
+            file = stack.enter_context(path.open("rb"))
+            buffer = _map_file(file.fileno())
+
+        if isinstance(buffer, mmap.mmap):
+            stack.enter_context(buffer)
+        yield InputBuffer(buffer)
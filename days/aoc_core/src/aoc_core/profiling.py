@@ -0,0 +1,137 @@
+"""Lightweight timing of the phases of a solution."""
+
+import _tracemalloc as tracemalloc  # The same functions, without the import cost of `tracemalloc`.
+import sys
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from time import perf_counter
+from typing import TextIO
+
+
+@dataclass
+class Measurement:
+    """The time taken and memory allocated by a block of code."""
+
+    elapsed: float = 0.0
+    """The time taken, in seconds."""
+    peak_memory: int | None = None
+    """The peak memory allocated, in bytes, if `tracemalloc` is tracing."""
+
+
+_RUNNING_PEAKS: list[int] = []
+"""The peak traced memory seen so far by each traced measurement in progress."""
+
+
+@contextmanager
+def measure() -> Iterator[Measurement]:
+    """
+    Measure the time taken by a block of code and, if `tracemalloc` is
+    tracing, the peak memory allocated within it. Measurements can be
+    nested without disturbing the peak memory of outer measurements.
+
+    """
+    measurement = Measurement()
+    tracing = tracemalloc.is_tracing()
+    baseline = 0
+    if tracing:
+        baseline, peak = tracemalloc.get_traced_memory()
+        if _RUNNING_PEAKS:
+            _RUNNING_PEAKS[-1] = max(_RUNNING_PEAKS[-1], peak)
+        tracemalloc.reset_peak()
+        _RUNNING_PEAKS.append(baseline)
+
+    start = perf_counter()
+    try:
+        yield measurement
+    finally:
+        measurement.elapsed = perf_counter() - start
+        if tracing:
+            _, peak = tracemalloc.get_traced_memory()
+            peak = max(_RUNNING_PEAKS.pop(), peak)
+            measurement.peak_memory = peak - baseline
+            if _RUNNING_PEAKS:
+                _RUNNING_PEAKS[-1] = max(_RUNNING_PEAKS[-1], peak)
+
+
+@dataclass(frozen=True, slots=True)
+class Span:
+    """A named phase of a solution, and how long it took."""
+
+    name: str
+    elapsed: float
+    peak_memory: int | None = None
+    parents: tuple[str, ...] = ()
+    """The names of the spans this span ran within, outermost first."""
+
+    @property
+    def path(self) -> str:
+        """The name of the span, qualified by the names of its parents."""
+        return "/".join((*self.parents, self.name))
+
+
+@dataclass
+class Recorder:
+    """A recorder of the spans which ran and the counts tallied while it was active."""
+
+    spans: list[Span] = field(default_factory=list)
+    """The spans which ran, in the order they finished."""
+    counters: Counter[str] = field(default_factory=Counter)
+    """The totals of the counts tallied, by name qualified by their spans."""
+    open_spans: list[str] = field(default_factory=list)
+    """The names of the spans which are running, outermost first."""
+
+    def report(self, file: TextIO = sys.stderr) -> None:
+        """Report the time taken by each span, indented by nesting, and the counts tallied."""
+        for span in sorted(self.spans, key=lambda span: (*span.parents, span.name)):
+            indent = "  " * len(span.parents)
+            print(f"{indent}{span.name}: {span.elapsed * 1000:.1f} ms", file=file)
+        for name, total in sorted(self.counters.items()):
+            print(f"{name}: {total}", file=file)
+
+
+_RECORDER: ContextVar[Recorder | None] = ContextVar("_RECORDER", default=None)
+
+
+@contextmanager
+def record() -> Iterator[Recorder]:
+    """Record the spans which run within the context."""
+    recorder = Recorder()
+    token = _RECORDER.set(recorder)
+    try:
+        yield recorder
+    finally:
+        _RECORDER.reset(token)
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    """Time a named phase of a solution. This does nothing unless recording."""
+    recorder = _RECORDER.get()
+    if recorder is None:
+        yield
+        return
+
+    parents = tuple(recorder.open_spans)
+    recorder.open_spans.append(name)
+    try:
+        with measure() as measurement:
+            yield
+    finally:
+        recorder.open_spans.pop()
+    recorder.spans.append(Span(name, measurement.elapsed, measurement.peak_memory, parents))
+
+
+def tally(name: str, amount: int = 1) -> None:
+    """
+    Add to a named count, such as the number of steps a search took. The
+    count is qualified by the names of the spans it's tallied within. This
+    does nothing unless recording, so tally totals after a loop rather
+    than within it.
+
+    """
+    recorder = _RECORDER.get()
+    if recorder is not None:
+        recorder.counters["/".join((*recorder.open_spans, name))] += amount
@@ -0,0 +1,145 @@
+"""Discovery of Advent of Code days through package entry points."""
+
+import sys
+from collections.abc import Iterable, Iterator, Sequence
+from contextlib import contextmanager
+from dataclasses import dataclass
+from importlib.abc import Loader, MetaPathFinder
+from importlib.machinery import ModuleSpec
+from importlib.metadata import EntryPoint, entry_points
+from time import perf_counter
+from types import ModuleType
+from typing import TYPE_CHECKING, TextIO, cast
+
+if TYPE_CHECKING:
+    from aoc_core import Day, Generator, Runner
+
+RUNNER_GROUP = "aoc.days"
+"""The entry point group day packages register their runners under."""
+GENERATOR_GROUP = "aoc.generators"
+"""The entry point group day packages register their input generators under."""
+
+
+class DayNotFoundError(LookupError):
+    """An error raised when no package provides a requested day."""
+
+
+def _day_entry_points(group: str) -> dict[int, EntryPoint]:
+    """Get the entry points in a group, keyed by day number."""
+    return {int(entry.name): entry for entry in entry_points(group=group)}
+
+
+def _load_entry_point(group: str, day: "Day") -> object:
+    """Import and return the object registered for a day in an entry point group."""
+    try:
+        entry = _day_entry_points(group)[day]
+    except KeyError as err:
+        raise DayNotFoundError(f"{day} is not implemented yet") from err
+    return entry.load()
+
+
+def available_days() -> list["Day"]:
+    """List the days which have an installed runner, without importing them."""
+    return sorted(_day_entry_points(RUNNER_GROUP))
+
+
+def load_runner(day: "Day") -> "Runner":
+    """Import and return the runner for a single day."""
+    return cast("Runner", _load_entry_point(RUNNER_GROUP, day))
+
+
+def available_engines(days: Iterable["Day"]) -> set[str]:
+    """
+    List the alternative engines any of the days have, by importing their
+    runners. A day's engines are the keys of its module's `ENGINES`.
+
+    """
+    engines: set[str] = set()
+    for day in days:
+        module = sys.modules[load_runner(day).__module__]
+        engines.update(getattr(module, "ENGINES", ()))
+    return engines
+
+
+def load_generator(day: "Day") -> "Generator":
+    """Import and return the input generator for a single day."""
+    return cast("Generator", _load_entry_point(GENERATOR_GROUP, day))
+
+
+@dataclass
+class ImportTiming:
+    """The time taken to import a module."""
+
+    name: str
+    self_time: float = 0.0
+    cumulative_time: float = 0.0
+
+
+class _TimedLoader(Loader):
+    """A loader which times the execution of the module it wraps."""
+
+    def __init__(self, loader: Loader, profiler: "ImportProfiler") -> None:
+        self._loader = loader
+        self._profiler = profiler
+
+    def create_module(self, spec: ModuleSpec) -> ModuleType | None:
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module: ModuleType) -> None:
+        timing = ImportTiming(module.__name__)
+        self._profiler.timings.append(timing)
+        self._profiler.stack.append(0.0)
+        start = perf_counter()
+        try:
+            self._loader.exec_module(module)
+        finally:
+            timing.cumulative_time = perf_counter() - start
+            timing.self_time = timing.cumulative_time - self._profiler.stack.pop()
+            if self._profiler.stack:
+                self._profiler.stack[-1] += timing.cumulative_time
+
+
+class ImportProfiler(MetaPathFinder):
+    """
+    A meta path finder which records how long each newly imported module
+    takes to execute, similar to `python -X importtime`.
+
+    """
+
+    def __init__(self) -> None:
+        self.timings: list[ImportTiming] = []
+        self.stack: list[float] = []
+
+    def find_spec(
+        self, fullname: str, path: Sequence[str] | None, target: ModuleType | None = None
+    ) -> ModuleSpec | None:
+        """Find a module spec using the other finders, timing its loader."""
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is None:
+                continue
+            if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                spec.loader = _TimedLoader(spec.loader, self)
+            return spec
+        return None
+
+    def report(self, file: TextIO = sys.stderr) -> None:
+        """Write the recorded timings, slowest first, in microseconds."""
+        print("import time:       self [us] | cumulative [us] | module", file=file)
+        for timing in sorted(self.timings, key=lambda t: t.cumulative_time, reverse=True):
+            self_us = round(timing.self_time * 1e6)
+            cumulative_us = round(timing.cumulative_time * 1e6)
+            print(f"import time: {self_us:>15} | {cumulative_us:>15} | {timing.name}", file=file)
+
+
+@contextmanager
+def profile_imports() -> Iterator[ImportProfiler]:
+    """Record the import time of every module first imported within the context."""
+    profiler = ImportProfiler()
+    sys.meta_path.insert(0, profiler)
+    try:
+        yield profiler
+    finally:
+        sys.meta_path.remove(profiler)
@@ -0,0 +1,57 @@
+"""Structured results from running Advent of Code solutions."""
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Literal
+
+from aoc_core.profiling import measure, span
+
+if TYPE_CHECKING:
+    from aoc_core import Day
+
+type PartName = Literal["one", "two"]
+"""The name of a single part of a day's challenge."""
+
+
+@dataclass(frozen=True, slots=True)
+class Result:
+    """The answer to a single part of a day's challenge."""
+
+    day: "Day"
+    part: PartName
+    answer: int
+    description: str
+    """A description of the answer, formatted with `answer`."""
+    elapsed: float
+    """The time taken to solve the part, in seconds."""
+    peak_memory: int | None = None
+    """
+    The peak memory allocated while solving the part, in bytes. This is only
+    recorded if `tracemalloc` is tracing.
+
+    """
+
+    def __str__(self) -> str:
+        return f"Part {self.part}: {self.description.format(answer=self.answer)}"
+
+
+def solve[**P](
+    day: "Day",
+    part: PartName,
+    description: str,
+    solver: Callable[P, int],
+    *args: P.args,
+    **kwargs: P.kwargs,
+) -> Result:
+    """Run a solver for a part of a day's challenge, timing it."""
+    with span(f"part {part}"), measure() as measurement:
+        answer = solver(*args, **kwargs)
+
+    return Result(
+        day=day,
+        part=part,
+        answer=answer,
+        description=description,
+        elapsed=measurement.elapsed,
+        peak_memory=measurement.peak_memory,
+    )
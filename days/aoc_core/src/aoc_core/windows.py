@@ -0,0 +1,54 @@
+"""Windowed iteration over values, in bulk for sequences such as lists and arrays."""
+
+import itertools
+from array import array
+from collections import deque
+from collections.abc import Iterable, Iterator, Sequence
+from operator import sub
+
+from aoc_core.cache import INT_TYPECODE
+
+
+def pairwise[T](iterable: Iterable[T]) -> Iterator[tuple[T, T]]:
+    """
+    Iterate over an iterable pairwise, returning the value and the
+    next value in a tuple.
+
+    """
+    return itertools.pairwise(iterable)
+
+
+def differences(values: Iterable[int]) -> Sequence[int]:
+    """
+    Get the difference between each value and the one before it. The
+    differences of an array are packed into an array of signed integers,
+    so an array of unsigned integers can have negative differences.
+
+    """
+    if isinstance(values, array):
+        return array(INT_TYPECODE, map(sub, itertools.islice(values, 1, None), values))
+    if isinstance(values, Sequence):
+        return list(map(sub, itertools.islice(values, 1, None), values))
+    return [next_ - current for current, next_ in itertools.pairwise(values)]
+
+
+def windows[T](values: Iterable[T], size: int) -> Iterator[Sequence[T]]:
+    """
+    Iterate over each run of `size` consecutive values. Windows over a
+    sequence are slices of it, so windows of an array are arrays, and
+    windows over other iterables are tuples.
+
+    """
+    if size < 1:
+        raise ValueError("`size` must be positive")
+
+    if isinstance(values, Sequence):
+        for start in range(len(values) - size + 1):
+            yield values[start : start + size]
+        return
+
+    iterator = iter(values)
+    window = deque(itertools.islice(iterator, size - 1), maxlen=size)
+    for value in iterator:
+        window.append(value)
+        yield tuple(window)
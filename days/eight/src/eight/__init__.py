@@ -1,61 +1,64 @@
 """The day eight solution to Advent of Code."""
 
 from collections import defaultdict
-from functools import partial
 from itertools import count, product
 from pathlib import Path
-from typing import Literal
-
-from aoc_core import Part
-
-ROOT = Path(__file__).resolve().parent
-DATA_ROOT = ROOT.joinpath("data")
-LIVE_INPUT = DATA_ROOT.joinpath("live.txt")
-TEST_INPUT = DATA_ROOT.joinpath("test.txt")
-
-type Char = str
-type Empty = Literal["."]
-type GridRow = list[Char | Empty]
-type Grid = list[GridRow]
+from typing import TYPE_CHECKING, TextIO
+
+from aoc_core import (
+    Codec,
+    Grid,
+    InputBuffer,
+    Part,
+    Result,
+    load_cached,
+    package_input,
+    solve,
+    span,
+    write_lines,
+)
+
+if TYPE_CHECKING:
+    from random import Random
+
+type Char = int
 type XIndex = int
 type YIndex = int
 type GridReference = tuple[XIndex, YIndex]
 type AntennaMapping = dict[Char, list[GridReference]]
 
-EMPTY: Literal[Empty] = "."
+EMPTY = ord(".")
+"""The byte value of an empty cell."""
+
+
+def parse_input(buffer: InputBuffer) -> Grid:
+    """Parse the input."""
+    return Grid.from_rows(buffer.lines())
+
+
+CODEC: Codec[Grid] = Codec(
+    encode=lambda grid: (grid.cells, grid.width), decode=lambda data: Grid(*data), version=2
+)
+"""How the parsed input is stored in the cache."""
 
 
-def load_input(*, test: bool = False) -> Grid:
+def load_input(*, test: bool = False, input_path: Path | None = None) -> Grid:
     """Load the input."""
-    input_path = TEST_INPUT if test else LIVE_INPUT
-    with input_path.open("r", encoding="utf-8") as input_file:
-        return [list(row.strip()) for row in input_file if row.strip()]
+    input_path = input_path or package_input(__file__, test=test)
+    return load_cached(input_path, "eight", parse_input, CODEC)
 
 
 def scan_characters(grid: Grid) -> AntennaMapping:
     """Scan the mapping of characters to group by antenna type."""
     characters: dict[Char, list[GridReference]] = defaultdict(list)
-    for y_index, row in enumerate(grid):
-        for x_index, char in enumerate(row):
-            if char != EMPTY:
-                characters[char].append((x_index, y_index))
+    for index, char in enumerate(grid.cells):
+        if char != EMPTY:
+            characters[char].append(grid.position(index))
     return characters
 
 
-def check_grid_reference_bounds(
-    grid_reference: GridReference, x_max_exclusive: int, y_max_exclusive: int
-) -> bool:
-    """Check the bounds of a grid reference."""
-    x_in_range = grid_reference[0] in range(x_max_exclusive)
-    y_in_range = grid_reference[1] in range(y_max_exclusive)
-    return x_in_range and y_in_range
-
-
 def count_antinodes(grid: Grid, *, include_resonant_harmonics: bool = False) -> int:
     """Count the antinodes in an antenna grid."""
-    in_bounds = partial(
-        check_grid_reference_bounds, y_max_exclusive=len(grid), x_max_exclusive=len(grid[0])
-    )
     antenna_mapping = scan_characters(grid)
 
     min_distance = 0 if include_resonant_harmonics else 2
@@ -77,7 +80,7 @@ def count_antinodes(grid: Grid, *, include_resonant_harmonics: bool = False) ->
                     (position_a[0] + (dist * x_diff), position_a[1] + (dist * y_diff)),
                     (position_b[0] - (dist * x_diff), position_b[1] - (dist * y_diff)),
                 ):
-                    if in_bounds(antinode):
+                    if grid.in_bounds(*antinode):
                         antinodes.add(antinode)
                         any_valid = True
                 if not any_valid or not include_resonant_harmonics:
@@ -85,22 +88,40 @@ def count_antinodes(grid: Grid, *, include_resonant_harmonics: bool = False) ->
     return len(antinodes)
 
 
-def part_one(grid: Grid) -> None:
+def part_one(grid: Grid) -> int:
     """Perform part one of the Advent of Code solution."""
-    print(f"Part one: {count_antinodes(grid)} antinodes")
+    return count_antinodes(grid)
 
 
-def part_two(grid: Grid) -> None:
+def part_two(grid: Grid) -> int:
     """Perform part two of the Advent of Code solution."""
-    print(f"Part two: {count_antinodes(grid, include_resonant_harmonics=True)} antinodes")
+    return count_antinodes(grid, include_resonant_harmonics=True)
+
+
+def generate(file: TextIO, size: int, rng: "Random") -> None:
+    """Generate a `size` by `size` map with about four antennas per row."""
+    frequencies = "0123456789abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ"
+    antennas_per_row = 4
 
+    def generate_row() -> str:
+        row = [chr(EMPTY)] * size
+        for x_index in rng.sample(range(size), min(size, antennas_per_row)):
+            row[x_index] = rng.choice(frequencies)
+        return "".join(row)
 
-def run(part: Part, *, test: bool = False) -> None:
+    write_lines(file, (generate_row() for _ in range(size)))
+
+
+def run(part: Part, *, test: bool = False, input_path: Path | None = None) -> list[Result]:
     """Run the solution to the eighth Advent of Code problem."""
-    grid = load_input(test=test)
+    with span("load"):
+        grid = load_input(test=test, input_path=input_path)
 
+    results: list[Result] = []
     if part in ("one", "both"):
-        part_one(grid)
+        results.append(solve(8, "one", "{answer} antinodes", part_one, grid))
 
     if part in ("two", "both"):
-        part_two(grid)
+        results.append(solve(8, "two", "{answer} antinodes", part_two, grid))
+
+    return results
@@ -1,15 +1,30 @@
 """The day five solution to Advent of Code."""
 
 from collections import defaultdict, deque
-from collections.abc import Mapping
+from collections.abc import Callable, Iterable, Mapping, Sequence
+from functools import reduce
+from itertools import chain, compress, repeat
+from operator import not_, or_
 from pathlib import Path
+from typing import TYPE_CHECKING, Any, NamedTuple, TextIO
 
-from aoc_core import Part
+from aoc_core import (
+    Codec,
+    InputBuffer,
+    Part,
+    Result,
+    load_cached,
+    pack_ragged,
+    package_input,
+    select_engine,
+    solve,
+    span,
+    unpack_ragged,
+    write_lines,
+)
 
-ROOT = Path(__file__).resolve().parent
-DATA_ROOT = ROOT.joinpath("data")
-LIVE_INPUT = DATA_ROOT.joinpath("live.txt")
-TEST_INPUT = DATA_ROOT.joinpath("test.txt")
+if TYPE_CHECKING:
+    from random import Random
 
 type PageNumber = int
 type PriorityRules = Mapping[PageNumber, set[PageNumber]]
@@ -17,19 +32,45 @@ type Update = deque[PageNumber]
 type Updates = list[Update]
 
 
-def load_input(*, test: bool = False) -> tuple[PriorityRules, Updates]:
-    """Load the input."""
-    input_path = TEST_INPUT if test else LIVE_INPUT
-    text = input_path.read_text().rstrip("\n")
-    rule_block, update_block = text.split("\n\n", 1)
+def parse_input(buffer: InputBuffer) -> tuple[PriorityRules, Updates]:
+    """Parse the input."""
+    priority_rules = defaultdict(set)
+    reports = []
+    for line in buffer.lines():
+        if b"|" in line:
+            prior_page, page = map(int, line.split(b"|"))
+            priority_rules[page].add(prior_page)
+        else:
+            reports.append(deque(map(int, line.split(b","))))
+    return priority_rules, reports
+
+
+def _encode(parsed: tuple[PriorityRules, Updates]) -> object:
+    """Encode the parsed input for the cache."""
+    priority_rules, updates = parsed
+    rules = [(page, *prior_pages) for page, prior_pages in priority_rules.items()]
+    return pack_ragged(rules), pack_ragged(updates)
+
 
-    rule_tuples = [tuple(map(int, rule.split("|"))) for rule in rule_block.split("\n")]
+def _decode(data: tuple[tuple[bytes, bytes], tuple[bytes, bytes]]) -> tuple[PriorityRules, Updates]:
+    """Decode the parsed input from the cache."""
+    rules, updates = data
     priority_rules = defaultdict(set)
-    for prior_page, page in rule_tuples:
-        priority_rules[page].add(prior_page)
+    for page, *prior_pages in unpack_ragged(rules):
+        priority_rules[page].update(prior_pages)
+    return priority_rules, list(map(deque, unpack_ragged(updates)))
+
+
+CODEC = Codec(encode=_encode, decode=_decode)
+"""How the parsed input is stored in the cache."""
 
-    reports = [deque(map(int, string.split(","))) for string in update_block.split("\n")]
-    return priority_rules, reports
+
+def load_input(
+    *, test: bool = False, input_path: Path | None = None
+) -> tuple[PriorityRules, Updates]:
+    """Load the input."""
+    input_path = input_path or package_input(__file__, test=test)
+    return load_cached(input_path, "five", parse_input, CODEC)
 
 
 def get_priority_rules_subset(priority_rules: PriorityRules, update: Update) -> PriorityRules:
@@ -38,13 +79,105 @@ def get_priority_rules_subset(priority_rules: PriorityRules, update: Update) ->
     return {page: priority_rules[page] & update_numbers for page in update}
 
 
-def is_ordered(update: Update, priority_rules_subset: PriorityRules) -> bool:
-    """Check whether an update is ordered."""
-    missing = set()
-    for page_number in reversed(update):
-        missing.discard(page_number)
-        missing |= priority_rules_subset[page_number]
-    return not missing
+class CyclicRulesError(ValueError):
+    """An error raised when the rules for an update's pages form a cycle, so it can't be ordered."""
+
+
+class RuleIndex:
+    """
+    The priority rules compiled into bitsets. Each page in the rules has
+    a bit, and masks of the pages which must come before and after it,
+    so checking a rule against a set of pages is a single `&`.
+
+    """
+
+    __slots__ = ("bits", "later_masks", "pages", "prior_masks")
+
+    def __init__(self, priority_rules: PriorityRules) -> None:
+        self.pages = sorted({*priority_rules, *chain.from_iterable(priority_rules.values())})
+        self.bits = {page: 1 << index for index, page in enumerate(self.pages)}
+        self.prior_masks = dict.fromkeys(self.pages, 0)
+        self.later_masks = dict.fromkeys(self.pages, 0)
+        for page, prior_pages in priority_rules.items():
+            for prior_page in prior_pages:
+                self.prior_masks[page] |= self.bits[prior_page]
+                self.later_masks[prior_page] |= self.bits[page]
+
+    def mask(self, pages: Iterable[PageNumber]) -> int:
+        """Get the mask of some pages, ignoring any without rules."""
+        return reduce(or_, map(self.bits.get, pages, repeat(0)), 0)
+
+    def unmask(self, mask: int) -> Iterable[PageNumber]:
+        """Iterate over the pages in a mask, lowest bit first."""
+        while mask:
+            bit = mask & -mask
+            mask ^= bit
+            yield self.pages[bit.bit_length() - 1]
+
+
+def check_updates(updates: Iterable[Sequence[PageNumber]], rules: RuleIndex) -> list[bool]:
+    """
+    Check whether each update is ordered, in one pass against one index
+    of the rules. Reading an update backwards, the masks of the pages
+    after each page are accumulated, and the update is out of order as
+    soon as they overlap the mask of the pages which must come before it.
+
+    """
+    prior_masks, bits = rules.prior_masks, rules.bits
+    ordered = []
+    for update in updates:
+        later = 0
+        for page_number in reversed(update):
+            if prior_masks.get(page_number, 0) & later:
+                ordered.append(False)
+                break
+            later |= bits.get(page_number, 0)
+        else:
+            ordered.append(True)
+    return ordered
+
+
+def is_ordered_indexed(update: Sequence[PageNumber], rules: RuleIndex) -> bool:
+    """Check whether an update is ordered, against an index of the rules."""
+    return check_updates([update], rules)[0]
+
+
+def reorder(update: Sequence[PageNumber], rules: RuleIndex) -> list[PageNumber]:
+    """
+    Order an update topologically. Raises a `CyclicRulesError` if the
+    rules for the update's pages form a cycle.
+
+    When there's a rule between every pair of pages, as there should be
+    for the order to be unique, sorting the pages by how many pages must
+    come before them orders the update. Otherwise, this falls back to
+    Kahn's algorithm: pages are placed once every page in the update
+    which must come before them has been, and pages which are ready at
+    once keep their order in the update.
+
+    """
+    present = rules.mask(update)
+    n_prior = {
+        page_number: (rules.prior_masks.get(page_number, 0) & present).bit_count()
+        for page_number in update
+    }
+    by_prior_pages = sorted(update, key=n_prior.__getitem__)
+    if is_ordered_indexed(by_prior_pages, rules):
+        return by_prior_pages
+
+    ready = deque(page_number for page_number in update if not n_prior[page_number])
+    ordered: list[PageNumber] = []
+    while ready:
+        page_number = ready.popleft()
+        ordered.append(page_number)
+        for later_page in rules.unmask(rules.later_masks.get(page_number, 0) & present):
+            n_prior[later_page] -= 1
+            if not n_prior[later_page]:
+                ready.append(later_page)
+
+    if len(ordered) < len(update):
+        cyclic = ", ".join(str(page) for page in update if n_prior[page])
+        raise CyclicRulesError(f"The rules for pages {cyclic} form a cycle")
+    return ordered
 
 
 def get_midpoint_index(length: int) -> int:
@@ -52,13 +185,12 @@ def get_midpoint_index(length: int) -> int:
     return length // 2 if length % 2 else ((length // 2) - 1)
 
 
-def part_one(ordered_updates: Updates) -> None:
+def part_one(ordered_updates: Updates) -> int:
     """Perform part one of the Advent of Code solution."""
-    update_sum = sum(update[get_midpoint_index(len(update))] for update in ordered_updates)
-    print(f"Part one: {update_sum} sum of middle page numbers in correct updates")
+    return sum(update[get_midpoint_index(len(update))] for update in ordered_updates)
 
 
-def part_two(unordered_updates: Updates, unordered_priority_rules: list[PriorityRules]) -> None:
+def part_two(unordered_updates: Updates, unordered_priority_rules: list[PriorityRules]) -> int:
     """Perform part two of the Advent of Code solution."""
     update_sum = 0
     for rule_subset, update in zip(unordered_priority_rules, unordered_updates, strict=True):
@@ -74,26 +206,112 @@ def part_two(unordered_updates: Updates, unordered_priority_rules: list[Priority
 
         update_sum += page_number
 
-    print(f"Part two: {update_sum} sum of middle page numbers in fixed incorrect updates")
+    return update_sum
+
+
+def part_two_topological(unordered_updates: Updates, rules: RuleIndex) -> int:
+    """Perform part two of the Advent of Code solution, ordering each update topologically."""
+    return sum(
+        reorder(update, rules)[get_midpoint_index(len(update))] for update in unordered_updates
+    )
+
+
+def partition(
+    priority_rules: PriorityRules, updates: Updates
+) -> tuple[Updates, Updates, list[PriorityRules]]:
+    """
+    Split the updates into ordered and unordered ones, with the rules for
+    the unordered ones. The updates are all checked against one index of
+    the rules, so the subsets of the rules are only built for the updates
+    which need fixing.
+
+    """
+    ordered_updates, unordered_updates, _ = partition_indexed(priority_rules, updates)
+    unordered_priority_rules = [
+        get_priority_rules_subset(priority_rules, update) for update in unordered_updates
+    ]
+    return ordered_updates, unordered_updates, unordered_priority_rules
+
+
+def partition_indexed(
+    priority_rules: PriorityRules, updates: Updates
+) -> tuple[Updates, Updates, RuleIndex]:
+    """Split the updates into ordered and unordered ones, against an index of the rules."""
+    rules = RuleIndex(priority_rules)
+    ordered = check_updates(updates, rules)
+    ordered_updates = list(compress(updates, ordered))
+    unordered_updates = list(compress(updates, map(not_, ordered)))
+    return ordered_updates, unordered_updates, rules
 
 
-def run(part: Part, *, test: bool = False) -> None:
+def generate(file: TextIO, size: int, rng: "Random") -> None:
+    """Generate a complete set of rules for some pages and `size` updates."""
+    pages = rng.sample(range(10, 100), 49)
+    rules = [
+        f"{prior_page}|{page}" for index, page in enumerate(pages) for prior_page in pages[:index]
+    ]
+    rng.shuffle(rules)
+    write_lines(file, rules)
+    file.write("\n")
+
+    position = {page: index for index, page in enumerate(pages)}
+
+    def generate_update() -> str:
+        update = rng.sample(pages, rng.randrange(5, 24, 2))
+        if rng.random() < 0.5:  # noqa: PLR2004
+            update.sort(key=position.__getitem__)
+        return ",".join(map(str, update))
+
+    write_lines(file, (generate_update() for _ in range(size)))
+
+
+class Engine[T](NamedTuple):
+    """A way of splitting up the updates and fixing the unordered ones."""
+
+    partition: Callable[[PriorityRules, Updates], tuple[Updates, Updates, T]]
+    part_two: Callable[[Updates, T], int]
+
+
+ENGINES: dict[str, Engine[Any]] = {
+    "python": Engine(partition, part_two),
+    "topological": Engine(partition_indexed, part_two_topological),
+}
+"""The engines which can be selected to solve the problem."""
+
+
+def run(part: Part, *, test: bool = False, input_path: Path | None = None) -> list[Result]:
     """Run the solution to the fifth Advent of Code problem."""
-    priority_rules, updates = load_input(test=test)
+    engine = select_engine(ENGINES)
+    with span("load"):
+        priority_rules, updates = load_input(test=test, input_path=input_path)
 
-    ordered_updates = []
-    unordered_updates = []
-    unordered_priority_rules = []
-    for update in updates:
-        priority_rule_subset = get_priority_rules_subset(priority_rules, update)
-        if is_ordered(update, priority_rule_subset):
-            ordered_updates.append(update)
-        else:
-            unordered_updates.append(update)
-            unordered_priority_rules.append(priority_rule_subset)
+    with span("partition"):
+        ordered_updates, unordered_updates, unordered_rules = engine.partition(
+            priority_rules, updates
+        )
 
+    results: list[Result] = []
     if part in ("one", "both"):
-        part_one(ordered_updates)
+        results.append(
+            solve(
+                5,
+                "one",
+                "{answer} sum of middle page numbers in correct updates",
+                part_one,
+                ordered_updates,
+            )
+        )
 
     if part in ("two", "both"):
-        part_two(unordered_updates, unordered_priority_rules)
+        results.append(
+            solve(
+                5,
+                "two",
+                "{answer} sum of middle page numbers in fixed incorrect updates",
+                engine.part_two,
+                unordered_updates,
+                unordered_rules,
+            )
+        )
+
+    return results
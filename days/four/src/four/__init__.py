@@ -1,117 +1,251 @@
 """The day four solution to Advent of Code."""
 
-from collections import Counter
-from itertools import repeat
+import re
+from array import array
+from collections import defaultdict
+from collections.abc import Iterable, Iterator, Mapping, Sequence
 from pathlib import Path
-from typing import Literal, cast
-
-from aoc_core import Part
-
-type Line = str
-type Lines = list[Line]
-type Word = str
-type LineIndex = int
-type CharIndex = int
-type Anchor = tuple[LineIndex, CharIndex]
-type Orientation = Literal[
-    "RIGHT", "LEFT", "UP", "DOWN", "UPRIGHT", "UPLEFT", "DOWNRIGHT", "DOWNLEFT"
-]
-type Match = tuple[Anchor, Orientation]
-type Matches = list[Match]
-
-ROOT = Path(__file__).resolve().parent
-DATA_ROOT = ROOT.joinpath("data")
-LIVE_INPUT = DATA_ROOT.joinpath("live.txt")
-TEST_INPUT = DATA_ROOT.joinpath("test.txt")
-
-
-def load_input(*, test: bool = False) -> Lines:
+from typing import TYPE_CHECKING, NamedTuple, TextIO
+
+from aoc_core import (
+    INT_TYPECODE,
+    NEIGHBOURS,
+    Codec,
+    Grid,
+    InputBuffer,
+    Offset,
+    Part,
+    Result,
+    load_cached,
+    package_input,
+    random_grid_rows,
+    solve,
+    span,
+    write_lines,
+)
+
+if TYPE_CHECKING:
+    from random import Random
+
+type Word = bytes
+type Reading = tuple[int, bool]
+"""A word, by its index in the words searched for, and whether it's read backwards."""
+type Trie = dict[int | None, "Trie"]
+type Template = tuple[bytes, ...]
+"""A small pattern of cells, row by row, which can include wildcards."""
+
+AXES: tuple[Offset, ...] = ((1, 0), (0, 1), (1, 1), (-1, 1))
+"""The directions of the rows, columns and diagonals, each of which is also read backwards."""
+TRIE_END = None
+"""The key which marks the end of a reading in a trie."""
+WILDCARD = ord(".")
+"""The cell in a template which matches any cell in the grid."""
+X_MAS: Template = (b"M.S", b".A.", b"M.S")
+"""Two diagonal "MAS"s crossing in an X, in one of their rotations."""
+
+
+class WordMatches(NamedTuple):
+    """Every match of the words searched for, as parallel arrays."""
+
+    words: array[int]
+    """The index of each match's word in the words searched for."""
+    starts: array[int]
+    """The flat index of each match's first letter."""
+    orientations: array[int]
+    """The index in `NEIGHBOURS` of the direction each match reads in."""
+
+
+def parse_input(buffer: InputBuffer) -> Grid:
+    """Parse the input."""
+    return Grid.from_rows(buffer.lines())
+
+
+CODEC: Codec[Grid] = Codec(
+    encode=lambda grid: (grid.cells, grid.width), decode=lambda data: Grid(*data), version=2
+)
+"""How the parsed input is stored in the cache."""
+
+
+def load_input(*, test: bool = False, input_path: Path | None = None) -> Grid:
     """Load the input."""
-    input_path = TEST_INPUT if test else LIVE_INPUT
-
-    with input_path.open("r", encoding="utf-8") as file:
-        return list(filter(None, map(str.strip, file.readlines())))
-
-
-def get_matches(lines: Lines, word: Word) -> Matches:  # noqa: C901
-    """Find matches for a given word in the lines."""
-    n_lines = len(lines)
-    line_length = len(lines[0])
-    word_length = len(word)
-
-    matches = []
-    for line_index, line in enumerate(lines):
-        check_down = line_index <= (n_lines - word_length)
-        check_up = line_index >= (word_length - 1)
-
-        line_lists = [(list(repeat(line, word_length)), "")]
-        if check_down:
-            line_lists.append((lines[line_index : line_index + word_length], "DOWN"))
-        if check_up:
-            end_index: int | None = line_index - word_length
-            if end_index == -1:
-                end_index = None
-            line_lists.append((lines[line_index:end_index:-1], "UP"))
-
-        for char_index, char in enumerate(line):
-            if char != word[0]:
-                continue
-
-            check_right = char_index <= (line_length - word_length)
-            check_left = char_index >= (word_length - 1)
-
-            char_index_lists = [(list(repeat(char_index, word_length)), "")]
-            if check_right:
-                char_index_lists.append(
-                    (list(range(char_index, char_index + word_length)), "RIGHT")
-                )
-            if check_left:
-                char_index_lists.append(
-                    (list(range(char_index, char_index - word_length, -1)), "LEFT")
-                )
-
-            for line_list_idx, (line_list, line_orient) in enumerate(line_lists):
-                for char_l_idx, (char_index_list, char_orient) in enumerate(char_index_lists):
-                    if line_list_idx == 0 and char_l_idx == 0:
-                        continue
-                    chars = [l[idx] for l, idx in zip(line_list, char_index_list, strict=True)]  # noqa: E741
-                    if "".join(chars) == word:
-                        orientation = cast(Orientation, f"{line_orient}{char_orient}")
-                        matches.append(((line_index, char_index), orientation))
-
+    input_path = input_path or package_input(__file__, test=test)
+    return load_cached(input_path, "four", parse_input, CODEC)
+
+
+def get_lines(grid: Grid, axis: Offset) -> Iterator[tuple[int, int, int]]:
+    """Iterate over the lines of the grid along an axis, as their first index, step and length."""
+    dx, dy = axis
+    starts = [grid.index(x, 0) for x in range(grid.width)] if dy else []
+    if dx:
+        edge = 0 if dx > 0 else grid.width - 1
+        starts.extend(grid.index(edge, y) for y in range(1 if dy else 0, grid.height))
+
+    for start in starts:
+        x, y = grid.position(start)
+        limits = [grid.height - y] if dy else []
+        if dx:
+            limits.append(grid.width - x if dx > 0 else x + 1)
+        yield start, grid.flat_offset(axis), min(limits)
+
+
+def _trie_pattern(trie: Trie) -> bytes:
+    """
+    Build a regex which matches the longest reading in a trie. Every
+    branch starts with a different byte, so the regex never backtracks
+    more than the length of the longest reading.
+
+    """
+    branches = [
+        re.escape(bytes((byte,))) + _trie_pattern(child)
+        for byte, child in trie.items()
+        if byte is not TRIE_END
+    ]
+    if not branches:
+        return b""
+    pattern = branches[0] if len(branches) == 1 else b"(?:" + b"|".join(branches) + b")"
+    return b"(?:" + pattern + b")?" if TRIE_END in trie else pattern
+
+
+def compile_readings(readings: Mapping[bytes, list[Reading]]) -> re.Pattern[bytes]:
+    """
+    Compile a regex which finds the longest reading starting at each
+    position in a line, including overlapping ones.
+
+    """
+    trie: Trie = {}
+    for reading in readings:
+        node = trie
+        for byte in reading:
+            node = node.setdefault(byte, {})
+        node[TRIE_END] = {}
+    return re.compile(b"(?=(" + _trie_pattern(trie) + b"))")
+
+
+def find_words(grid: Grid, words: Sequence[Word]) -> WordMatches:
+    """
+    Find every word, reading in any of the eight directions, in one pass.
+
+    Each row, column and diagonal is sliced out of the grid once, and
+    scanned for every word and its reverse at once by a regex built from
+    a trie of them, so the scan doesn't slow down with more words. A word
+    read backwards along a line is a match in the opposite direction,
+    starting from its other end. Any shorter readings which start where
+    the longest one does are its prefixes, so are found from it.
+
+    """
+    if not all(words):
+        raise ValueError("Words must not be empty")
+
+    readings: defaultdict[bytes, list[Reading]] = defaultdict(list)
+    for word_index, word in enumerate(words):
+        readings[word].append((word_index, False))
+        readings[word[::-1]].append((word_index, True))
+    found_with = {
+        reading: [
+            (word_index, backwards, length)
+            for length in range(1, len(reading) + 1)
+            for word_index, backwards in readings.get(reading[:length], ())
+        ]
+        for reading in readings
+    }
+    pattern = compile_readings(readings)
+
+    matches = WordMatches(array(INT_TYPECODE), array(INT_TYPECODE), array("B"))
+    cells = grid.cells
+    for dx, dy in AXES:
+        orientations = (NEIGHBOURS.index((dx, dy)), NEIGHBOURS.index((-dx, -dy)))
+        for start, step, length in get_lines(grid, (dx, dy)):
+            # The diagonals of a grid one cell wide are single cells, with no step between them.
+            line = cells[start : start + (length - 1) * step + 1 : max(step, 1)]
+            for match in pattern.finditer(line):
+                position = match.start()
+                for word_index, backwards, reading_length in found_with[match[1]]:
+                    first = position + reading_length - 1 if backwards else position
+                    matches.words.append(word_index)
+                    matches.starts.append(start + first * step)
+                    matches.orientations.append(orientations[backwards])
     return matches
 
 
-def part_one(lines: Lines) -> None:
+def rotate(template: Template) -> Template:
+    """Rotate a template a quarter turn clockwise."""
+    return tuple(bytes(column[::-1]) for column in zip(*template, strict=True))
+
+
+def rotations(template: Template) -> list[Template]:
+    """Get each distinct rotation of a template."""
+    rotated = [template]
+    for _ in range(3):
+        rotated.append(rotate(rotated[-1]))
+    return list(dict.fromkeys(rotated))
+
+
+def count_templates(grid: Grid, templates: Iterable[Template], wildcard: int = WILDCARD) -> int:
+    """
+    Count where each template matches the grid, by its top left cell.
+
+    Masks of the grid are big integers with a byte for each cell, set to
+    one where the cell has a value. For each cell of a template which
+    isn't a wildcard, the mask of its value is shifted down by the cell's
+    flat offset and combined with the others, leaving a one wherever the
+    whole template matches. The number of passes over the grid depends on
+    the size of the templates, not the grid, and the masks of each value
+    are shared between the templates.
+
+    """
+    width, height, cells = grid.width, grid.height, grid.cells
+    value_masks: dict[int, int] = {}
+
+    def value_mask(value: int) -> int:
+        if (mask := value_masks.get(value)) is None:
+            table = bytes(byte == value for byte in range(0x100))
+            mask = value_masks[value] = int.from_bytes(cells.translate(table), "little")
+        return mask
+
+    n_matches = 0
+    for template in templates:
+        template_width = len(template[0]) if template else 0
+        if not template_width or any(len(row) != template_width for row in template):
+            raise ValueError("A template must have rows of the same, positive width")
+        n_columns, n_rows = width - template_width + 1, height - len(template) + 1
+        if n_columns < 1 or n_rows < 1:
+            continue
+
+        row_anchors = b"\x01" * n_columns + bytes(template_width - 1)
+        matched = int.from_bytes(row_anchors * n_rows, "little")
+        for y, row in enumerate(template):
+            for x, value in enumerate(row):
+                if value != wildcard:
+                    matched &= value_mask(value) >> (8 * grid.index(x, y))
+        n_matches += matched.bit_count()
+    return n_matches
+
+
+def part_one(grid: Grid) -> int:
     """Perform part one of the Advent of Code solution."""
-    matches = get_matches(lines, "XMAS")
-    print(f"Part one: {len(matches)} matches")
+    return len(find_words(grid, [b"XMAS"]).starts)
 
 
-def part_two(lines: Lines) -> None:
+def part_two(grid: Grid) -> int:
     """Perform part two of the Advent of Code solution."""
-    matches = get_matches(lines, "MAS")
-    match_centres = []
-    for anchor, orientation in matches:
-        if orientation == "UPRIGHT":
-            match_centres.append((anchor[0] - 1, anchor[1] + 1))
-        elif orientation == "UPLEFT":
-            match_centres.append((anchor[0] - 1, anchor[1] - 1))
-        elif orientation == "DOWNRIGHT":
-            match_centres.append((anchor[0] + 1, anchor[1] + 1))
-        elif orientation == "DOWNLEFT":
-            match_centres.append((anchor[0] + 1, anchor[1] - 1))
-
-    count = sum(value > 1 for value in Counter(match_centres).values())
-    print(f"Part two: {count} matches")
-
-
-def run(part: Part, *, test: bool = False) -> None:
+    return count_templates(grid, rotations(X_MAS))
+
+
+def generate(file: TextIO, size: int, rng: "Random") -> None:
+    """Generate a `size` by `size` word search."""
+    write_lines(file, random_grid_rows(rng, size, size, "XMAS", (1, 1, 1, 1)))
+
+
+def run(part: Part, *, test: bool = False, input_path: Path | None = None) -> list[Result]:
     """Run the solution to the fourth Advent of Code problem."""
-    lines = load_input(test=test)
+    with span("load"):
+        grid = load_input(test=test, input_path=input_path)
 
+    results: list[Result] = []
     if part in ("one", "both"):
-        part_one(lines)
+        results.append(solve(4, "one", "{answer} matches", part_one, grid))
 
     if part in ("two", "both"):
-        part_two(lines)
+        results.append(solve(4, "two", "{answer} matches", part_two, grid))
+
+    return results
@@ -1,17 +1,31 @@
 """The day nine solution to Advent of Code."""
 
 from collections import deque
+from collections.abc import Sequence
 from copy import deepcopy
 from dataclasses import dataclass
 from itertools import count
 from pathlib import Path
+from typing import TYPE_CHECKING, TextIO
 
-from aoc_core import Part
+from aoc_core import (
+    Codec,
+    InputBuffer,
+    Part,
+    Result,
+    load_cached,
+    package_input,
+    solve,
+    span,
+    tally,
+    write_lines,
+)
 
-ROOT = Path(__file__).resolve().parent
-DATA_ROOT = ROOT.joinpath("data")
-LIVE_INPUT = DATA_ROOT.joinpath("live.txt")
-TEST_INPUT = DATA_ROOT.joinpath("test.txt")
+if TYPE_CHECKING:
+    from random import Random
+
+ZERO = ord("0")
+"""The byte value of the zero digit."""
 
 
 @dataclass
@@ -30,11 +44,8 @@ class FileSystemNode:
 type FileSystem = deque[FileSystemNode]
 
 
-def load_input(*, test: bool = False) -> FileSystem:
-    """Load the input."""
-    input_path = TEST_INPUT if test else LIVE_INPUT
-    numbers = list(map(int, input_path.read_text().rstrip()))
-
+def build_filesystem(numbers: Sequence[int]) -> FileSystem:
+    """Build a filesystem from the numbers in a disk map."""
     filesystem: FileSystem = deque()
     for first_index in range(0, len(numbers), 2):
         occupied = numbers[first_index]
@@ -47,6 +58,26 @@ def load_input(*, test: bool = False) -> FileSystem:
     return filesystem
 
 
+def parse_input(buffer: InputBuffer) -> FileSystem:
+    """Parse the input."""
+    return build_filesystem([digit - ZERO for line in buffer.lines() for digit in line])
+
+
+CODEC: Codec[FileSystem] = Codec(
+    encode=lambda filesystem: bytes(
+        number for node in filesystem for number in (node.occupied, node.free)
+    ),
+    decode=build_filesystem,
+)
+"""How the parsed input is stored in the cache."""
+
+
+def load_input(*, test: bool = False, input_path: Path | None = None) -> FileSystem:
+    """Load the input."""
+    input_path = input_path or package_input(__file__, test=test)
+    return load_cached(input_path, "nine", parse_input, CODEC)
+
+
 def calculate_checksum(filesystem: FileSystem) -> int:
     """Calculate the checksum for a filesystem."""
     checksum = 0
@@ -134,24 +165,42 @@ def render(filesystem: FileSystem) -> None:
     print()
 
 
-def part_one(filesystem: FileSystem) -> None:
+def part_one(filesystem: FileSystem) -> int:
     """Perform part one of the Advent of Code solution."""
-    checksum = calculate_checksum(compact(filesystem))
-    print(f"Part one: checksum is {checksum}")
+    with span("compaction"):
+        compacted = compact(filesystem)
+    tally("compacted nodes", len(compacted))
+    with span("checksum"):
+        return calculate_checksum(compacted)
 
 
-def part_two(filesystem: FileSystem) -> None:
+def part_two(filesystem: FileSystem) -> int:
     """Perform part two of the Advent of Code solution."""
-    checksum = calculate_checksum(compact_whole_files(filesystem))
-    print(f"Part two: checksum is {checksum}")
+    with span("compaction"):
+        compacted = compact_whole_files(filesystem)
+    tally("compacted nodes", len(compacted))
+    with span("checksum"):
+        return calculate_checksum(compacted)
 
 
-def run(part: Part, *, test: bool = False) -> None:
+def generate(file: TextIO, size: int, rng: "Random") -> None:
+    """Generate a disk map of `size` digits."""
+    digits = (
+        str(rng.randint(1, 9) if index % 2 == 0 else rng.randint(0, 9)) for index in range(size)
+    )
+    write_lines(file, ["".join(digits)])
+
+
+def run(part: Part, *, test: bool = False, input_path: Path | None = None) -> list[Result]:
     """Run the solution to the ninth Advent of Code problem."""
-    filesystem = load_input(test=test)
+    with span("load"):
+        filesystem = load_input(test=test, input_path=input_path)
 
+    results: list[Result] = []
     if part in ("one", "both"):
-        part_one(filesystem)
+        results.append(solve(9, "one", "checksum is {answer}", part_one, filesystem))
 
     if part in ("two", "both"):
-        part_two(filesystem)
+        results.append(solve(9, "two", "checksum is {answer}", part_two, filesystem))
+
+    return results
@@ -1,55 +1,241 @@
 """The day one solution to Advent of Code."""
 
-import re
+from array import array
 from collections import Counter
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from contextlib import ExitStack
+from itertools import groupby, repeat
+from operator import mul, sub
 from pathlib import Path
+from typing import TYPE_CHECKING, Any, NamedTuple, TextIO
 
-from aoc_core import Part
+from aoc_core import (
+    INT_TYPECODE,
+    Codec,
+    InputBuffer,
+    Part,
+    Result,
+    SortedRuns,
+    load_cached,
+    open_input,
+    pack_ints,
+    package_input,
+    select_engine,
+    solve,
+    span,
+    unpack_ints,
+    write_lines,
+)
 
-type LocationList = list[int]
+if TYPE_CHECKING:
+    from random import Random
+
+type LocationList = Sequence[int]
 type LeftList = LocationList
 type RightList = LocationList
 
-ROOT = Path(__file__).resolve().parent
-DATA_ROOT = ROOT.joinpath("data")
-LIVE_INPUT = DATA_ROOT.joinpath("live.txt")
-TEST_INPUT = DATA_ROOT.joinpath("test.txt")
+CHUNK_SIZE = 1 << 24
+"""The number of bytes of the input the array engine parses at a time."""
+STREAM_CHUNK_SIZE = 1 << 22
+"""The number of bytes of the input the stream engine sorts into each run."""
+
+
+def parse_input(buffer: InputBuffer) -> tuple[LeftList, RightList]:
+    """Parse the input."""
+    entries = [map(int, line.split(maxsplit=1)) for line in buffer.lines()]
+    left_entries, right_entries = map(list, zip(*entries, strict=True))
+    return left_entries, right_entries
+
+
+CODEC: Codec[tuple[LeftList, RightList]] = Codec(
+    encode=lambda lists: (pack_ints(lists[0]), pack_ints(lists[1])),
+    decode=lambda data: (unpack_ints(data[0]), unpack_ints(data[1])),
+)
+"""How the parsed input is stored in the cache."""
 
 
-def load_input(*, test: bool = False) -> tuple[LeftList, RightList]:
+def load_input(*, test: bool = False, input_path: Path | None = None) -> tuple[LeftList, RightList]:
     """Load the input."""
-    input_path = TEST_INPUT if test else LIVE_INPUT
+    input_path = input_path or package_input(__file__, test=test)
+    return load_cached(input_path, "one", parse_input, CODEC)
+
+
+def split_columns(chunk: bytes) -> tuple[list[int], list[int]]:
+    """Split whole lines of the input into its columns, in bulk rather than line by line."""
+    fields = chunk.split()
+    if len(fields) % 2:
+        raise ValueError("Every line of the input must have two locations")
+    return list(map(int, fields[::2])), list(map(int, fields[1::2]))
+
+
+def parse_columns(buffer: InputBuffer) -> tuple[array[int], array[int]]:
+    """Parse the input into arrays."""
+    left_array, right_array = array(INT_TYPECODE), array(INT_TYPECODE)
+    for chunk in buffer.chunks(CHUNK_SIZE):
+        left_values, right_values = split_columns(chunk)
+        left_array.extend(left_values)
+        right_array.extend(right_values)
+    return left_array, right_array
 
-    with input_path.open("r", encoding="utf-8") as file:
-        lines = filter(None, map(str.strip, file))
-        entries = [map(int, re.split(r"\s+", line, maxsplit=1)) for line in lines]
-        left_entries, right_entries = map(list, zip(*entries, strict=True))
-        return left_entries, right_entries
 
+ARRAY_CODEC: Codec[tuple[array[int], array[int]]] = Codec(
+    encode=lambda arrays: (arrays[0].tobytes(), arrays[1].tobytes()),
+    decode=lambda data: (array(INT_TYPECODE, data[0]), array(INT_TYPECODE, data[1])),
+)
+"""How the array engine's parsed input is stored in the cache, sharing entries with `CODEC`."""
 
-def part_one(left_list: LeftList, right_list: RightList) -> None:
+
+def load_arrays(
+    *, test: bool = False, input_path: Path | None = None
+) -> tuple[array[int], array[int]]:
+    """Load the input into arrays."""
+    input_path = input_path or package_input(__file__, test=test)
+    return load_cached(input_path, "one", parse_columns, ARRAY_CODEC)
+
+
+def load_streamed(
+    *, test: bool = False, input_path: Path | None = None
+) -> tuple[SortedRuns, SortedRuns]:
+    """
+    Load the input a chunk at a time, spilling sorted runs of each list to
+    disk, so that lists larger than memory can be solved. The parsed input
+    isn't cached, and the caller must close the runs.
+
+    """
+    input_path = input_path or package_input(__file__, test=test)
+    with ExitStack() as stack:  # Remove the runs if the input can't be loaded.
+        left_list = stack.enter_context(SortedRuns())
+        right_list = stack.enter_context(SortedRuns())
+        with open_input(input_path) as buffer:
+            for chunk in buffer.chunks(STREAM_CHUNK_SIZE):
+                left_values, right_values = split_columns(chunk)
+                left_list.add(left_values)
+                right_list.add(right_values)
+        stack.pop_all()
+    return left_list, right_list
+
+
+def part_one(left_list: LeftList, right_list: RightList) -> int:
     """Perform part one of the Advent of Code solution."""
     left_list = sorted(left_list)
     right_list = sorted(right_list)
-    distance = sum(abs(left - right) for (left, right) in zip(left_list, right_list, strict=True))
-    print(f"Part one: {distance} total distance between locations")
+    return sum(abs(left - right) for (left, right) in zip(left_list, right_list, strict=True))
 
 
-def part_two(left_list: LeftList, right_list: RightList) -> None:
+def part_two(left_list: LeftList, right_list: RightList) -> int:
     """Perform part two of the Advent of Code solution."""
     value_scores = Counter(right_list)
     for value in value_scores:
         value_scores[value] *= value
-    similarity_score = sum(value_scores[value] for value in left_list)
-    print(f"Part two: {similarity_score} total similarity score")
+    return sum(value_scores[value] for value in left_list)
+
+
+def part_one_bulk(left_list: LeftList, right_list: RightList) -> int:
+    """Perform part one of the Advent of Code solution, without a loop in Python."""
+    if len(left_list) != len(right_list):
+        raise ValueError("The location lists must be the same length")
+    return sum(map(abs, map(sub, sorted(left_list), sorted(right_list))))
+
 
+def part_two_bulk(left_list: LeftList, right_list: RightList) -> int:
+    """Perform part two of the Advent of Code solution, without a loop in Python."""
+    counts = Counter(right_list)
+    return sum(map(mul, left_list, map(counts.get, left_list, repeat(0))))
 
-def run(part: Part, *, test: bool = False) -> None:
+
+def generate(file: TextIO, size: int, rng: "Random") -> None:
+    """Generate a pair of location lists with `size` entries each."""
+    # Draw from a range about twice the size so that some locations repeat.
+    lowest = 10_000
+    highest = lowest + (2 * size)
+    lines = (
+        f"{rng.randrange(lowest, highest)}   {rng.randrange(lowest, highest)}" for _ in range(size)
+    )
+    write_lines(file, lines)
+
+
+def count_repeats(locations: Iterable[int]) -> Iterator[tuple[int, int]]:
+    """Count each run of equal locations in a sorted list, without holding the run in memory."""
+    for location, repeats in groupby(locations):
+        yield location, sum(1 for _ in repeats)
+
+
+def part_one_streamed(left_list: SortedRuns, right_list: SortedRuns) -> int:
+    """Perform part one of the Advent of Code solution, merging the sorted runs."""
+    if len(left_list) != len(right_list):
+        raise ValueError("The location lists must be the same length")
+    return sum(map(abs, map(sub, left_list, right_list)))
+
+
+def part_two_streamed(left_list: SortedRuns, right_list: SortedRuns) -> int:
+    """
+    Perform part two of the Advent of Code solution, joining the sorted
+    lists as they're merged, so only a block of each run is in memory.
+
+    """
+    right_counts = count_repeats(right_list)
+    right_location, right_count = next(right_counts, (None, 0))
+    score = 0
+    for location, count in count_repeats(left_list):
+        while right_location is not None and right_location < location:
+            right_location, right_count = next(right_counts, (None, 0))
+        if right_location is None:
+            break
+        if right_location == location:
+            score += location * count * right_count
+    return score
+
+
+class Engine[T](NamedTuple):
+    """A way of loading and solving the input."""
+
+    load: Callable[..., tuple[T, T]]
+    part_one: Callable[[T, T], int]
+    part_two: Callable[[T, T], int]
+
+
+ENGINES: dict[str, Engine[Any]] = {
+    "python": Engine(load_input, part_one, part_two),
+    "array": Engine(load_arrays, part_one_bulk, part_two_bulk),
+    "stream": Engine(load_streamed, part_one_streamed, part_two_streamed),
+}
+"""The engines which can be selected to solve the problem."""
+
+
+def run(part: Part, *, test: bool = False, input_path: Path | None = None) -> list[Result]:
     """Run the solution to the first Advent of Code problem."""
-    left_list, right_list = load_input(test=test)
+    engine = select_engine(ENGINES)
+    with span("load"):
+        left_list, right_list = engine.load(test=test, input_path=input_path)
+
+    results: list[Result] = []
+    with ExitStack() as stack:
+        for location_list in (left_list, right_list):
+            if isinstance(location_list, SortedRuns):  # Remove the spilled runs once solved.
+                stack.enter_context(location_list)
+
+        if part in ("one", "both"):
+            results.append(
+                solve(
+                    1,
+                    "one",
+                    "{answer} total distance between locations",
+                    engine.part_one,
+                    left_list,
+                    right_list,
+                )
+            )
 
-    if part in ("one", "both"):
-        part_one(left_list, right_list)
+        if part in ("two", "both"):
+            results.append(
+                solve(
+                    1,
+                    "two",
+                    "{answer} total similarity score",
+                    engine.part_two,
+                    left_list,
+                    right_list,
+                )
+            )
 
-    if part in ("two", "both"):
-        part_two(left_list, right_list)
+    return results
@@ -1,22 +1,32 @@
 """The day seven solution to Advent of Code."""
 
 import math
-from collections.abc import Sequence
+from collections.abc import Callable, Sequence
 from operator import add, mul
 from pathlib import Path
-from typing import Protocol, cast
-
-from aoc_core import Part
-
-ROOT = Path(__file__).resolve().parent
-DATA_ROOT = ROOT.joinpath("data")
-LIVE_INPUT = DATA_ROOT.joinpath("live.txt")
-TEST_INPUT = DATA_ROOT.joinpath("test.txt")
+from typing import TYPE_CHECKING, Protocol, TextIO, cast
+
+from aoc_core import (
+    Codec,
+    InputBuffer,
+    Part,
+    Result,
+    load_cached,
+    package_input,
+    solve,
+    span,
+    write_lines,
+)
+
+if TYPE_CHECKING:
+    from random import Random
 
 type TestValue = int
 type CalibrationNumbers = Sequence[int]
 type Calibration = tuple[TestValue, CalibrationNumbers]
 type Calibrations = list[Calibration]
+type Inverse = Callable[[int, int], int | None]
+"""Undoes an operator, getting the left operand from the result and the right operand."""
 
 
 class Operator(Protocol):
@@ -26,54 +36,151 @@ class Operator(Protocol):
     def __call__(v1: int, v2: int, /) -> int: ...  # noqa: D102
 
 
-def load_input(*, test: bool = False) -> Calibrations:
+def parse_input(buffer: InputBuffer) -> Calibrations:
+    """Parse the input."""
+    split_lines = (line.split(b": ") for line in buffer.lines())
+    return [(int(test_value), list(map(int, eqn.split()))) for test_value, eqn in split_lines]
+
+
+# Test values can be too large to pack into arrays, but `marshal` stores them compactly.
+CODEC: Codec[Calibrations] = Codec(encode=list, decode=list)
+"""How the parsed input is stored in the cache."""
+
+
+def load_input(*, test: bool = False, input_path: Path | None = None) -> Calibrations:
     """Load the input."""
-    input_path = TEST_INPUT if test else LIVE_INPUT
-    with input_path.open("r", encoding="utf-8") as input_file:
-        split_lines = (line.strip().split(": ") for line in input_file)
-        return [(int(test_value), list(map(int, eqn.split()))) for test_value, eqn in split_lines]
+    input_path = input_path or package_input(__file__, test=test)
+    return load_cached(input_path, "seven", parse_input, CODEC)
+
+
+def concat(v1: int, v2: int) -> int:
+    """Concatenate two integers as strings."""
+    return cast(int, (v1 * (10 ** (int(math.log10(v2)) + 1))) + v2)
+
+
+def unadd(result: int, number: int) -> int | None:
+    """Undo adding a number, if the other number would be positive."""
+    return result - number if result > number else None
+
+
+def unmul(result: int, number: int) -> int | None:
+    """Undo multiplying by a number, if the result is divisible by it."""
+    return result // number if not result % number else None
+
+
+def unconcat(result: int, number: int) -> int | None:
+    """Undo concatenating a number, if the result ends with it and has digits before it."""
+    divisor = 10 ** len(str(number))
+    return result // divisor if result % divisor == number and result >= divisor else None
+
+
+INVERSES: dict[Operator, Inverse] = {add: unadd, mul: unmul, concat: unconcat}
+"""How to undo each operator, for calibrations of positive numbers."""
+
+
+def evaluate_forwards(
+    test_value: TestValue, calibration_numbers: CalibrationNumbers, operators: Sequence[Operator]
+) -> bool:
+    """Check whether a calibration can be true, by evaluating every combination of operators."""
+    accumulators = list(calibration_numbers[:1])
+    for number in calibration_numbers[1:]:
+        new_accumulators: list[int] = []
+        for current_value in accumulators:
+            new_accumulators.extend(operator(current_value, number) for operator in operators)
+        accumulators = new_accumulators
+    return test_value in set(accumulators)
+
+
+def solve_backwards(
+    test_value: TestValue, calibration_numbers: CalibrationNumbers, inverses: Sequence[Inverse]
+) -> bool:
+    """
+    Check whether a calibration of positive numbers can be true, working
+    back from the test value. Each operator is undone for the last number,
+    depth first, stopping at the first way to reach the first number.
+
+    An operator can only be undone if the result allows it: a product must
+    be divisible by the number, and a concatenation must end with it. As
+    the numbers are positive, no operator makes the value smaller, so any
+    branch which falls below the first number is pruned too.
+
+    """
+    first = calibration_numbers[0]
+    stack = [(test_value, len(calibration_numbers) - 1)]
+    while stack:
+        value, index = stack.pop()
+        if not index:
+            if value == first:
+                return True
+            continue
+
+        number = calibration_numbers[index]
+        stack.extend(
+            (previous, index - 1)
+            for inverse in inverses
+            if (previous := inverse(value, number)) is not None and previous >= first
+        )
+    return False
 
 
 def evaluate_total_calibration_result(
     calibrations: Calibrations, operators: Sequence[Operator]
 ) -> int:
-    """Evaluate the total calibration result, given some operators."""
+    """
+    Evaluate the total calibration result, given some operators. Each
+    calibration is solved backwards if the operators can be undone and its
+    numbers are positive, and by evaluating them forwards otherwise.
+
+    """
+    inverses = [INVERSES[operator] for operator in operators if operator in INVERSES]
+    invertible = len(inverses) == len(operators)
     running_total = 0
     for test_value, calibration_numbers in calibrations:
-        accumulators = list(calibration_numbers[:1])
-        for number in calibration_numbers[1:]:
-            new_accumulators: list[int] = []
-            for current_value in accumulators:
-                new_accumulators.extend(operator(current_value, number) for operator in operators)
-            accumulators = new_accumulators
-        if test_value in set(accumulators):
+        if invertible and min(calibration_numbers) > 0:
+            calibrated = solve_backwards(test_value, calibration_numbers, inverses)
+        else:
+            calibrated = evaluate_forwards(test_value, calibration_numbers, operators)
+        if calibrated:
             running_total += test_value
     return running_total
 
 
-def concat(v1: int, v2: int) -> int:
-    """Concatenate two integers as strings."""
-    return cast(int, (v1 * (10 ** (int(math.log10(v2)) + 1))) + v2)
-
-
-def part_one(calibrations: Calibrations) -> None:
+def part_one(calibrations: Calibrations) -> int:
     """Perform part one of the Advent of Code solution."""
-    running_total = evaluate_total_calibration_result(calibrations, (add, mul))
-    print(f"Part one: {running_total} total calibration result")
+    return evaluate_total_calibration_result(calibrations, (add, mul))
 
 
-def part_two(calibrations: Calibrations) -> None:
+def part_two(calibrations: Calibrations) -> int:
     """Perform part two of the Advent of Code solution."""
-    running_total = evaluate_total_calibration_result(calibrations, (add, mul, concat))
-    print(f"Part two: {running_total} total calibration result")
+    return evaluate_total_calibration_result(calibrations, (add, mul, concat))
+
 
+def generate(file: TextIO, size: int, rng: "Random") -> None:
+    """Generate `size` calibrations, some of which can be made true."""
+    operators: tuple[Operator, ...] = (add, mul, concat)
 
-def run(part: Part, *, test: bool = False) -> None:
+    def generate_calibration() -> str:
+        numbers = [rng.randint(1, 999) for _ in range(rng.randint(3, 12))]
+        test_value = numbers[0]
+        for number in numbers[1:]:
+            test_value = rng.choice(operators)(test_value, number)
+        if rng.random() < 0.5:  # noqa: PLR2004
+            test_value += 1
+        return f"{test_value}: {' '.join(map(str, numbers))}"
+
+    write_lines(file, (generate_calibration() for _ in range(size)))
+
+
+def run(part: Part, *, test: bool = False, input_path: Path | None = None) -> list[Result]:
     """Run the solution to the seventh Advent of Code problem."""
-    calibrations = load_input(test=test)
+    with span("load"):
+        calibrations = load_input(test=test, input_path=input_path)
 
+    results: list[Result] = []
     if part in ("one", "both"):
-        part_one(calibrations)
+        results.append(solve(7, "one", "{answer} total calibration result", part_one, calibrations))
 
     if part in ("two", "both"):
-        part_two(calibrations)
+        results.append(solve(7, "two", "{answer} total calibration result", part_two, calibrations))
+
+    return results
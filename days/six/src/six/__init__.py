@@ -1,44 +1,143 @@
 """The day six solution to Advent of Code."""
 
-from collections.abc import Iterator
-from concurrent.futures import Future, ProcessPoolExecutor
+import os
+from array import array
+from collections import deque
+from collections.abc import Buffer, Iterator, Mapping, Sequence
+from contextlib import ExitStack, contextmanager
 from dataclasses import dataclass
 from pathlib import Path
-from typing import ClassVar, Literal, cast
-
-from aoc_core import Part
-
-ROOT = Path(__file__).resolve().parent
-DATA_ROOT = ROOT.joinpath("data")
-LIVE_INPUT = DATA_ROOT.joinpath("live.txt")
-TEST_INPUT = DATA_ROOT.joinpath("test.txt")
+from typing import TYPE_CHECKING, Final, Literal, NamedTuple, Self, TextIO, cast
+
+from aoc_core import (
+    DIRECTIONS,
+    INT_TYPECODE,
+    Codec,
+    Grid,
+    InputBuffer,
+    Part,
+    Result,
+    load_cached,
+    package_input,
+    random_grid_rows,
+    solve,
+    span,
+    tally,
+    write_lines,
+)
+
+if TYPE_CHECKING:
+    from multiprocessing.shared_memory import SharedMemory
+    from random import Random
 
 type Direction = Literal["up", "down", "left", "right"]
-type Distance = int
-type GuardMarker = Literal["^", ">", "v", "<"]
-type Obstacle = Literal["#"]
-type FreeSpace = Literal["."]
-type GridMarker = Obstacle | FreeSpace
-type GridRow = list[GridMarker]
-type Grid = list[GridRow]
-type Visited = set[Guard]
-
-OBSTACLE: Obstacle = "#"
-FREE_SPACE: FreeSpace = "."
-GUARD_MARKER_MAPPING: dict[GuardMarker, Direction] = {
-    "^": "up",
-    ">": "right",
-    "v": "down",
-    "<": "left",
+type State = int
+"""A guard, as the flat index of their cell times four, plus the index of their direction."""
+
+OBSTACLE = ord("#")
+"""The byte value of an obstacle."""
+FREE_SPACE = ord(".")
+"""The byte value of a free space."""
+GUARD_MARKER_MAPPING: dict[int, Direction] = {
+    ord("^"): "up",
+    ord(">"): "right",
+    ord("v"): "down",
+    ord("<"): "left",
 }
+"""The directions of the guard, by the byte value of their marker."""
+DIRECTION_NAMES: tuple[Direction, ...] = ("up", "right", "down", "left")
+"""The directions by their index in `DIRECTIONS`, which are clockwise, so turning adds one."""
+DIRECTION_INDICES: dict[Direction, int] = {
+    name: index for index, name in enumerate(DIRECTION_NAMES)
+}
+"""The index of each direction."""
+OFFSETS = tuple(DIRECTIONS.values())
+"""The offset of each direction, by its index."""
+N_DIRECTIONS = len(OFFSETS)
+"""The number of directions, by which a cell's index is multiplied in a state."""
+EXIT = -1
+"""Where a guard stops if they walk off the grid."""
+STOP_TYPECODE: Final = "i"
+"""The typecode of a jump table's stops, if the grid's indices fit in it."""
+PARALLEL_CHUNKS_PER_WORKER = 4
+"""How many batches of candidate obstacles there are for each worker, to balance the load."""
+SPIRAL_GAPS = (2, 4)
+"""The range of the gaps between the rings of a generated guard's spiral patrol."""
 
 
 class InLoopError(Exception):
     """An error raised when a loop is encountered."""
 
 
-class OutOfBoundsError(Exception):
-    """An error raised when a guard goes out of bounds."""
+class VisitedStates:
+    """
+    The states a guard has been in, as a bit for each direction in a byte
+    for each cell. The cells with bits set are tracked, so clearing it to
+    reuse for another patrol only touches those cells.
+
+    """
+
+    __slots__ = ("_cells", "_touched")
+
+    def __init__(self, n_cells: int) -> None:
+        self._cells = bytearray(n_cells)
+        self._touched: list[int] = []
+
+    def __contains__(self, state: State) -> bool:
+        index, direction = divmod(state, N_DIRECTIONS)
+        return bool(self._cells[index] >> direction & 1)
+
+    @property
+    def n_positions(self) -> int:
+        """The number of cells the guard has been in, facing any direction."""
+        return len(self._touched)
+
+    def add(self, state: State) -> bool:
+        """Add a state, returning whether it's new."""
+        index, direction = divmod(state, N_DIRECTIONS)
+        cell, bit = self._cells[index], 1 << direction
+        if cell & bit:
+            return False
+        if not cell:
+            self._touched.append(index)
+        self._cells[index] = cell | bit
+        return True
+
+    def clear(self) -> None:
+        """Remove every state."""
+        cells = self._cells
+        for index in self._touched:
+            cells[index] = 0
+        self._touched.clear()
+
+
+def patrol_states(
+    grid: Grid, state: State, visited: VisitedStates | None = None
+) -> Iterator[State]:
+    """
+    Patrol a grid from a state, yielding the guard's state at each step,
+    but not when all they've done is turn.
+
+    """
+    visited = visited if visited is not None else VisitedStates(len(grid))
+    cells, width, height = grid.cells, grid.width, grid.height
+    index, direction = divmod(state, N_DIRECTIONS)
+    y, x = divmod(index, width)
+    yield state
+
+    while True:
+        if not visited.add(index * N_DIRECTIONS + direction):
+            raise InLoopError("The guard's route will loop and never finish")
+
+        dx, dy = OFFSETS[direction]
+        if not (0 <= x + dx < width and 0 <= y + dy < height):  # Patrol finished.
+            return
+
+        if cells[index + dy * width + dx] == FREE_SPACE:
+            x, y, index = x + dx, y + dy, index + dy * width + dx
+            yield index * N_DIRECTIONS + direction
+        else:
+            direction = (direction + 1) % N_DIRECTIONS
 
 
 @dataclass(frozen=True)
@@ -48,160 +147,395 @@ class Position:
     x: int
     y: int
 
-    def move(self, direction: Direction) -> "Position":
-        """Move the point in a given direction, returning a new position."""
-        cls = type(self)
-        x, y = self.x, self.y
 
-        if direction == "up":
-            new = cls(x=x, y=y - 1)
-        elif direction == "down":
-            new = cls(x=x, y=y + 1)
-        elif direction == "right":
-            new = cls(x=x + 1, y=y)
-        elif direction == "left":
-            new = cls(x=x - 1, y=y)
-        return new
+class ResumePoint(NamedTuple):
+    """A position on a guard's patrol to try an obstacle at, and where to resume the patrol from."""
 
-    def in_bounds(self, upper_x_bound: int, upper_y_bound: int) -> bool:
-        """Check whether the point is in bounds."""
-        return (0 <= self.y <= upper_y_bound) and (0 <= self.x <= upper_x_bound)
+    obstacle: int
+    """The flat index the obstacle goes at."""
+    state: State
+    """The guard just before they first reach the obstacle."""
+    n_turns: int
+    """How many times the guard has turned by then."""
 
 
 @dataclass(frozen=True)
 class Guard:
     """A guard with a position and direction."""
 
-    TURN_MAPPING: ClassVar[dict[Direction, Direction]] = {
-        "up": "right",
-        "right": "down",
-        "down": "left",
-        "left": "up",
-    }
-    """A mapping of directions the guard should turn to when hitting an obstacle."""
-
     position: Position
     direction: Direction
 
-    def move(self) -> "Guard":
-        """Move the guard."""
-        return type(self)(position=self.position.move(self.direction), direction=self.direction)
+    def state(self, width: int) -> State:
+        """Encode the guard as a state, on a grid of a given width."""
+        index = self.position.y * width + self.position.x
+        return index * N_DIRECTIONS + DIRECTION_INDICES[self.direction]
 
-    def turn(self) -> "Guard":
-        """Turn the guard."""
-        return type(self)(position=self.position, direction=self.TURN_MAPPING[self.direction])
+    @classmethod
+    def from_state(cls, state: State, width: int) -> "Guard":
+        """Decode a guard from a state, on a grid of a given width."""
+        index, direction = divmod(state, N_DIRECTIONS)
+        y, x = divmod(index, width)
+        return cls(position=Position(x=x, y=y), direction=DIRECTION_NAMES[direction])
 
-    def in_bounds(self, upper_x_bound: int, upper_y_bound: int) -> bool:
-        """Check whether the guard is in bounds."""
-        return self.position.in_bounds(upper_x_bound, upper_y_bound)
-
-    def patrol(self, grid: Grid, visited: Visited | None = None) -> Iterator["Guard"]:
+    def patrol(self, grid: Grid, visited: VisitedStates | None = None) -> Iterator["Guard"]:
         """Patrol a grid, yielding the guard at each step."""
-        visited = visited or set()
-        upper_y_bound = len(grid) - 1
-        upper_x_bound = len(grid[0]) - 1
-
-        guard = self
-        yield guard
+        for state in patrol_states(grid, self.state(grid.width), visited):
+            yield self.from_state(state, grid.width)
 
-        while True:
-            if guard in visited:
-                raise InLoopError("The guard's route will loop and never finish")
-            visited.add(guard)
-
-            new_guard = guard.move()
-            if not new_guard.in_bounds(upper_x_bound, upper_y_bound):  # Patrol finished.
-                return
-
-            if grid[new_guard.position.y][new_guard.position.x] == FREE_SPACE:
-                guard = new_guard
-                yield guard
-            else:  # No point in yielding the guard if all they've done is turn
-                guard = guard.turn()
-
-    def patrol_will_loop(self, grid: Grid, visited: Visited | None = None) -> bool:
+    def patrol_will_loop(self, grid: Grid, visited: VisitedStates | None = None) -> bool:
         """Check whether a guard's patrol will loop."""
         try:
-            all(self.patrol(grid, visited))
+            deque(patrol_states(grid, self.state(grid.width), visited), maxlen=0)
         except InLoopError:
             return True
         return False
 
+    def resume_points(self, grid: Grid) -> Iterator[ResumePoint]:
+        """
+        Yield each position on the guard's patrol but their start, the
+        first time they reach it. An obstacle there leaves the patrol the
+        same up to the guard just before it, so a loop check can resume
+        from that guard, and the patrol loops if it repeats any turn made
+        before then.
+
+        """
+        route = patrol_states(grid, self.state(grid.width))
+        state = next(route)
+        reached = bytearray(len(grid))
+        reached[state // N_DIRECTIONS] = True
+        n_turns = 0
+        for next_state in route:
+            if not reached[obstacle := next_state // N_DIRECTIONS]:
+                yield ResumePoint(obstacle, state, n_turns)
+                reached[obstacle] = True
+
+            n_turns += (next_state - state) % N_DIRECTIONS
+            state = next_state
+
+
+def _line_slice(start: int, step: int, begin: int, end: int) -> slice:
+    """Get the slice of the cells from `begin` to `end` along a line of a flat grid."""
+    stop = start + end * step
+    return slice(start + begin * step, stop if stop >= 0 else None, step)
+
+
+class JumpTable:
+    """
+    Where a guard walking from each cell in each direction stops, in
+    front of the next obstacle, or `EXIT` if they walk off the grid, so a
+    patrol jumps from turn to turn. Adding an obstacle makes a new table
+    which shares the stops, and checks whether each jump hits it instead.
+    The stops are views of a buffer, which can be shared memory, so worker
+    processes can share one copy of a large table.
+
+    """
+
+    __slots__ = ("obstacle", "stops", "width")
+
+    def __init__(
+        self, stops: Sequence[memoryview], width: int, obstacle: int | None = None
+    ) -> None:
+        self.stops = stops
+        self.width = width
+        self.obstacle = obstacle
+
+    @staticmethod
+    def typecode(n_cells: int) -> Literal["i", "q"]:
+        """Get the typecode of the stops of a grid with `n_cells` cells."""
+        fits = n_cells < 1 << (8 * array(STOP_TYPECODE).itemsize - 1)
+        return STOP_TYPECODE if fits else INT_TYPECODE
+
+    @classmethod
+    def buffer_size(cls, n_cells: int) -> int:
+        """Get the number of bytes the stops of a grid with `n_cells` cells take up."""
+        return N_DIRECTIONS * n_cells * array(cls.typecode(n_cells)).itemsize
+
+    @classmethod
+    def from_buffer(cls, buffer: Buffer, n_cells: int, width: int) -> Self:
+        """View a table whose stops are in a buffer, without copying them."""
+        view = memoryview(buffer)[: cls.buffer_size(n_cells)].cast(cls.typecode(n_cells))
+        return cls([view[start : start + n_cells] for start in range(0, len(view), n_cells)], width)
+
+    @classmethod
+    def from_grid(cls, grid: Grid, buffer: Buffer | None = None) -> Self:
+        """
+        Build the table for a grid, in `buffer` if it's given. Each line
+        of the grid is searched for obstacles in the direction of travel,
+        and the stops of the cells between each pair of obstacles are
+        filled in at once.
+
+        """
+        cells, needle = grid.cells, bytes((OBSTACLE,))
+        typecode = cls.typecode(len(grid))
+        if buffer is None:
+            buffer = bytearray(cls.buffer_size(len(grid)))
+        table = cls.from_buffer(buffer, len(grid), grid.width)
+        for direction_stops, (dx, dy) in zip(table.stops, OFFSETS, strict=True):
+            direction_stops[:] = array(typecode, [EXIT]) * len(grid)
+            step = grid.flat_offset((dx, dy))
+            if dy:
+                edge, length = 0 if dy > 0 else grid.height - 1, grid.height
+                starts = [grid.index(x, edge) for x in range(grid.width)]
+            else:
+                edge, length = 0 if dx > 0 else grid.width - 1, grid.width
+                starts = [grid.index(edge, y) for y in range(grid.height)]
+
+            for start in starts:
+                line = cells[_line_slice(start, step, 0, length)]
+                begin, obstacle = 0, line.find(needle)
+                while obstacle != -1:
+                    segment = _line_slice(start, step, begin, obstacle)
+                    stop = start + (obstacle - 1) * step
+                    direction_stops[segment] = array(typecode, [stop]) * (obstacle - begin)
+                    begin, obstacle = obstacle + 1, line.find(needle, obstacle + 1)
+        return table
+
+    def release(self) -> None:
+        """Release the views of the stops, so shared memory they're in can be closed."""
+        for direction_stops in self.stops:
+            direction_stops.release()
+
+    def with_obstacle(self, index: int) -> "JumpTable":
+        """Get a table with an obstacle added, without copying the stops."""
+        return JumpTable(self.stops, self.width, index)
+
+    def next_stop(self, index: int, direction: int) -> int:
+        """Get where a guard walking from a cell in a direction stops."""
+        stop = self.stops[direction][index]
+        if self.obstacle is None:
+            return stop
+
+        dx, dy = OFFSETS[direction]
+        y, x = divmod(index, self.width)
+        obstacle_y, obstacle_x = divmod(self.obstacle, self.width)
+        if (obstacle_x - x) * (1 - abs(dx)) or (obstacle_y - y) * (1 - abs(dy)):
+            return stop  # The obstacle isn't on this line.
+        to_obstacle = (obstacle_x - x) * dx + (obstacle_y - y) * dy
+        if to_obstacle <= 0:
+            return stop  # The obstacle is behind the guard.
+        stop_y, stop_x = divmod(stop, self.width)
+        if stop == EXIT or to_obstacle <= (stop_x - x) * dx + (stop_y - y) * dy:
+            return self.obstacle - (dy * self.width + dx)
+        return stop
+
+    def route_turns(self, state: State) -> dict[State, int]:
+        """
+        Get the turns of a patrol, as the states the guard turns from, in
+        the order they're made, until the guard leaves the grid.
+
+        """
+        index, direction = divmod(state, N_DIRECTIONS)
+        turns: dict[State, int] = {}
+        while (index := self.next_stop(index, direction)) != EXIT:
+            turn = index * N_DIRECTIONS + direction
+            if turn in turns:
+                raise InLoopError("The guard's route will loop and never finish")
+            turns[turn] = len(turns)
+            direction = (direction + 1) % N_DIRECTIONS
+        return turns
+
+    def patrol_will_loop(
+        self,
+        state: State,
+        route_turns: Mapping[State, int] | None = None,
+        n_prior_turns: int = 0,
+        visited: VisitedStates | None = None,
+    ) -> bool:
+        """
+        Check whether a patrol will loop, by whether a turn repeats. A
+        patrol resumed partway along a route, from the `route_turns` of
+        the table without the obstacle, also loops if it repeats one of
+        the first `n_prior_turns` turns of the route. Passing `visited`
+        reuses it for the turns, clearing it first.
+
+        """
+        route_turns = route_turns or {}
+        if visited is None:
+            visited = VisitedStates(len(self.stops[0]))
+        else:
+            visited.clear()
+
+        index, direction = divmod(state, N_DIRECTIONS)
+        while (index := self.next_stop(index, direction)) != EXIT:
+            turn = index * N_DIRECTIONS + direction
+            if not visited.add(turn) or route_turns.get(turn, n_prior_turns) < n_prior_turns:
+                return True
+            direction = (direction + 1) % N_DIRECTIONS
+        return False
+
 
-def load_input(*, test: bool = False) -> tuple[Grid, Guard]:
-    """Load the input."""
-    input_path = TEST_INPUT if test else LIVE_INPUT
+def parse_input(buffer: InputBuffer) -> tuple[Grid, Guard]:
+    """Parse the input."""
+    grid = Grid.from_rows(buffer.lines())
+    if unexpected := grid.cells.translate(
+        None, bytes((FREE_SPACE, OBSTACLE, *GUARD_MARKER_MAPPING))
+    ):
+        raise ValueError(f"Unexpected character in input: {chr(unexpected[0])}")
 
-    grid: Grid = []
-    lines = [line.strip() for line in input_path.read_text().split("\n") if line.strip()]
-    guard: Guard | None = None
+    guard_indices = [index for marker in GUARD_MARKER_MAPPING for index in grid.find_all(marker)]
+    if not guard_indices:
+        raise ValueError("No guard found")
+    if len(guard_indices) > 1:
+        raise ValueError("Only one guard expected")
 
-    for line_index, line in enumerate(lines):
-        row: GridRow = []
-        for char_index, char in enumerate(line):
-            if char in (FREE_SPACE, OBSTACLE):
-                row.append(cast(GridMarker, char))
-                continue
+    (guard_index,) = guard_indices
+    x, y = grid.position(guard_index)
+    guard = Guard(position=Position(x=x, y=y), direction=GUARD_MARKER_MAPPING[grid[guard_index]])
+    cells = bytearray(grid.cells)
+    cells[guard_index] = FREE_SPACE
+    return Grid(bytes(cells), grid.width), guard
 
-            if char not in GUARD_MARKER_MAPPING:
-                raise ValueError(f"Unexpected character in input: {char}")
-            if guard is not None:
-                raise ValueError("Only one guard expected")
 
-            position = Position(x=char_index, y=line_index)
-            guard = Guard(
-                position=position, direction=GUARD_MARKER_MAPPING[cast(GuardMarker, char)]
-            )
-            row.append(FREE_SPACE)
+def _encode(parsed: tuple[Grid, Guard]) -> object:
+    """Encode the parsed input for the cache."""
+    grid, guard = parsed
+    return grid.cells, grid.width, guard.position.x, guard.position.y, guard.direction
 
-        grid.append(row)
 
-    if guard is None:
-        raise ValueError("No guard found")
-    return grid, guard
+def _decode(data: tuple[bytes, int, int, int, Direction]) -> tuple[Grid, Guard]:
+    """Decode the parsed input from the cache."""
+    cells, width, x, y, direction = data
+    return Grid(cells, width), Guard(position=Position(x=x, y=y), direction=direction)
 
 
-def part_one(grid: Grid, guard: Guard) -> None:
-    """Perform part one of the Advent of Code solution."""
-    unique_positions = len({guard.position for guard in guard.patrol(grid)})
-    print(f"Part one: {unique_positions} unique positions")
+CODEC = Codec(encode=_encode, decode=_decode, version=2)
+"""How the parsed input is stored in the cache."""
 
 
-def build_new_grid(grid: Grid, obstacle_position: Position) -> Grid:
-    """Build a new grid without a full deep copy."""
-    x, y = obstacle_position.x, obstacle_position.y
-    new_grid = grid.copy()
-    new_row = grid[y].copy()
-    new_row[x] = OBSTACLE
-    new_grid[y] = new_row
-    return new_grid
+def load_input(*, test: bool = False, input_path: Path | None = None) -> tuple[Grid, Guard]:
+    """Load the input."""
+    input_path = input_path or package_input(__file__, test=test)
+    return load_cached(input_path, "six", parse_input, CODEC)
 
 
-def part_two(grid: Grid, guard: Guard) -> None:
-    """Perform part two of the Advent of Code solution."""
-    route = guard.patrol(grid)
-    guard = next(route)
-    tried_obstacles = set()
+def part_one(grid: Grid, guard: Guard) -> int:
+    """Perform part one of the Advent of Code solution."""
+    visited = VisitedStates(len(grid))
+    with span("patrol"):
+        deque(patrol_states(grid, guard.state(grid.width), visited), maxlen=0)
+    return visited.n_positions
 
-    futures: list[Future[bool]] = []
-    with ProcessPoolExecutor() as pool:
-        for next_guard in route:
-            if (obstacle_position := next_guard.position) not in tried_obstacles:
-                new_grid = build_new_grid(grid, obstacle_position)
-                futures.append(pool.submit(Guard.patrol_will_loop, guard, new_grid))
-                tried_obstacles.add(obstacle_position)
 
-            guard = next_guard
+_WORKER_ROUTES: list[tuple["SharedMemory", JumpTable, dict[State, int], VisitedStates]] = []
+"""
+The jump table in shared memory and the turns of the guard's route,
+shared with a worker process as it starts, so they aren't sent with every
+batch, and the visited states the worker reuses for each loop check. The
+shared memory is kept so it stays open for the life of the worker.
 
-    print(f"Part two: {n_looped_patrols} possible patrol loops")
+"""
 
 
-def run(part: Part, *, test: bool = False) -> None:
+@contextmanager
+def _shared_jump_table(grid: Grid) -> Iterator[tuple[JumpTable, str]]:
+    """Build a grid's jump table in shared memory, which is removed afterwards."""
+    # Imported here so part one doesn't pay for the import.
+    from multiprocessing.shared_memory import SharedMemory  # noqa: PLC0415
+
+    shared = SharedMemory(create=True, size=JumpTable.buffer_size(len(grid)))
+    try:
+        table = JumpTable.from_grid(grid, cast("memoryview", shared.buf))  # Only None once closed.
+        try:
+            yield table, shared.name
+        finally:
+            table.release()
+    finally:
+        shared.close()
+        shared.unlink()
+
+
+def _share_route(shared_name: str, n_cells: int, width: int, route_turns: dict[State, int]) -> None:
+    """Map the jump table, and keep it and the turns of the guard's route, in a worker process."""
+    from multiprocessing.shared_memory import SharedMemory  # noqa: PLC0415
+
+    # The process which made the shared memory removes it, not the workers.
+    shared = SharedMemory(shared_name, track=False)
+    table = JumpTable.from_buffer(cast("memoryview", shared.buf), n_cells, width)
+    _WORKER_ROUTES.append((shared, table, route_turns, VisitedStates(n_cells)))
+
+
+def _count_loops(resume_points: list[ResumePoint]) -> int:
+    """Count the obstacles which make the guard's patrol loop, resuming it from before each."""
+    ((_, table, route_turns, visited),) = _WORKER_ROUTES
+    return sum(
+        table.with_obstacle(obstacle).patrol_will_loop(state, route_turns, n_turns, visited)
+        for obstacle, state, n_turns in resume_points
+    )
+
+
+def part_two(grid: Grid, guard: Guard) -> int:
+    """
+    Perform part two of the Advent of Code solution. The candidate
+    obstacles are checked in batches by worker processes, which map the
+    grid's jump table from shared memory, and are sent the turns of the
+    route once as they start. Each check resumes the patrol from just
+    before the obstacle.
+
+    """
+    # Imported here so part one doesn't pay for the process pool's imports.
+    from concurrent.futures import ProcessPoolExecutor  # noqa: PLC0415
+
+    with span("route"):
+        resume_points = list(guard.resume_points(grid))
+    tally("candidate obstacles", len(resume_points))
+
+    n_batches = PARALLEL_CHUNKS_PER_WORKER * (os.process_cpu_count() or 1)
+    # Routes which loop are slower to check, and they cluster, so the batches are interleaved.
+    batches = [
+        resume_points[start::n_batches] for start in range(min(n_batches, len(resume_points)))
+    ]
+    with ExitStack() as stack:
+        with span("jump table"):
+            table, shared_name = stack.enter_context(_shared_jump_table(grid))
+            route_turns = table.route_turns(guard.state(grid.width))
+        initargs = (shared_name, len(grid), grid.width, route_turns)
+        with (
+            ProcessPoolExecutor(initializer=_share_route, initargs=initargs) as pool,
+            span("patrol"),
+        ):
+            return sum(pool.map(_count_loops, batches))
+
+
+def generate(file: TextIO, size: int, rng: "Random") -> None:
+    """
+    Generate a `size` by `size` map with a guard who spirals out from the
+    middle until they leave it, so their patrol grows with the map. The
+    obstacles which turn the guard are placed at the end of each leg, and
+    the rest of the map is scattered with obstacles off the patrol.
+
+    """
+    rows = [
+        bytearray(row.encode()) for row in random_grid_rows(rng, size, size, "#.", (0.02, 0.98))
+    ]
+    x = y = size // 2
+    rows[y][x] = ord("^")
+    direction, length = 0, rng.randint(*SPIRAL_GAPS)
+    while True:
+        dx, dy = OFFSETS[direction]
+        for _ in range(length):
+            x, y = x + dx, y + dy
+            if not (0 <= x < size and 0 <= y < size):
+                write_lines(file, (row.decode() for row in rows))
+                return
+            rows[y][x] = FREE_SPACE
+        if 0 <= x + dx < size and 0 <= y + dy < size:
+            rows[y + dy][x + dx] = OBSTACLE
+        direction = (direction + 1) % N_DIRECTIONS
+        if direction in {0, 2}:  # Each ring's legs are longer than the last's.
+            length += rng.randint(*SPIRAL_GAPS)
+
+
+def run(part: Part, *, test: bool = False, input_path: Path | None = None) -> list[Result]:
     """Run the solution to the sixth Advent of Code problem."""
-    grid, guard = load_input(test=test)
+    with span("load"):
+        grid, guard = load_input(test=test, input_path=input_path)
 
+    results: list[Result] = []
     if part in ("one", "both"):
-        part_one(grid, guard)
+        results.append(solve(6, "one", "{answer} unique positions", part_one, grid, guard))
 
     if part in ("two", "both"):
-        part_two(grid, guard)
+        results.append(solve(6, "two", "{answer} possible patrol loops", part_two, grid, guard))
+
+    return results
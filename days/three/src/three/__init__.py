@@ -1,60 +1,223 @@
 """The day three solution to Advent of Code."""
 
+import os
 import re
-from itertools import starmap
-from operator import mul
+from collections.abc import Callable, Iterable
+from contextlib import ExitStack
+from itertools import repeat
 from pathlib import Path
-from typing import Literal
-
-from aoc_core import Part
-
-ROOT = Path(__file__).resolve().parent
-DATA_ROOT = ROOT.joinpath("data")
-LIVE_INPUT = DATA_ROOT.joinpath("live.txt")
-PART_ONE_TEST_INPUT = DATA_ROOT.joinpath("test_part_one.txt")
-PART_TWO_TEST_INPUT = DATA_ROOT.joinpath("test_part_two.txt")
-
-
-type Instructions = str
-
-
-def load_input(part: Literal["one", "two"], *, test: bool = False) -> Instructions:
-    """Load the input."""
-    test_path = PART_ONE_TEST_INPUT if part == "one" else PART_TWO_TEST_INPUT
-    input_path = test_path if test else LIVE_INPUT
-    return input_path.read_text()
-
-
-def eval_matches(instructions: Instructions) -> int:
-    """Evaluate the sum of the applied instructions."""
-    pattern = re.compile(r"mul\(([0-9]{1,3}),([0-9]{1,3})\)")
-    numbers = (map(int, match.groups()) for match in pattern.finditer(instructions))
-    return sum(starmap(mul, numbers))
-
-
-def part_one(instructions: Instructions) -> None:
+from typing import TYPE_CHECKING, NamedTuple, TextIO
+
+from aoc_core import (
+    STDIN,
+    InputBuffer,
+    Part,
+    PartName,
+    Result,
+    open_input,
+    package_input,
+    select_engine,
+    solve,
+    span,
+    write_lines,
+)
+
+if TYPE_CHECKING:
+    from mmap import mmap
+    from random import Random
+
+INSTRUCTION_PATTERN = re.compile(rb"mul\(([0-9]{1,3}),([0-9]{1,3})\)|(do\(\))|(don't\(\))")
+"""The instructions in a memory dump, with the group matched telling them apart."""
+MUL, DO, DONT = 2, 3, 4
+"""The last group matched by each instruction."""
+MAX_INSTRUCTION_LENGTH = len("mul(999,999)")
+"""The length of the longest instruction."""
+PARALLEL_CHUNKS_PER_WORKER = 4
+"""The number of chunks to split the input into for each worker, when scanning in parallel."""
+MIN_PARALLEL_CHUNK_SIZE = 1 << 20
+"""The fewest bytes to scan in each chunk, when scanning in parallel."""
+
+
+class Totals(NamedTuple):
+    """The sums of the multiplications in a memory dump."""
+
+    all: int
+    """The sum of every multiplication."""
+    enabled: int
+    """The sum of the multiplications which weren't disabled by `don't()`."""
+
+
+class ChunkTotals(NamedTuple):
+    """
+    The sums of the multiplications in a chunk of a memory dump, which
+    can be combined with the chunks before it once it's known whether the
+    multiplications are enabled at the start of the chunk.
+
+    """
+
+    all: int
+    """The sum of every multiplication."""
+    leading: int
+    """The sum of the multiplications before the first `do()` or `don't()`."""
+    enabled: int
+    """The sum of the enabled multiplications after the first `do()` or `don't()`."""
+    ends_enabled: bool | None
+    """Whether multiplications are enabled at the end, or `None` if that's unchanged."""
+
+
+def scan_range(data: "mmap | bytes", start: int, end: int) -> ChunkTotals:
+    """
+    Sum the multiplications which start within a range of a memory dump,
+    in a single pass. Instructions which start in the range may end past
+    it. No instruction can start inside another, so scanning from the
+    start of a range never finds one the scan of the range before didn't.
+
+    """
+    stop = min(end + MAX_INSTRUCTION_LENGTH - 1, len(data))
+    total = leading = enabled_total = 0
+    enabled: bool | None = None
+    for match in INSTRUCTION_PATTERN.finditer(data, start, stop):
+        if match.start() >= end:
+            break
+        instruction = match.lastindex
+        if instruction == MUL:
+            product = int(match[1]) * int(match[2])
+            total += product
+            if enabled is None:
+                leading += product
+            elif enabled:
+                enabled_total += product
+        else:
+            enabled = instruction == DO
+    return ChunkTotals(total, leading, enabled_total, enabled)
+
+
+def combine(chunks: Iterable[ChunkTotals]) -> Totals:
+    """Combine the sums of consecutive chunks of a memory dump, which starts enabled."""
+    total = enabled_total = 0
+    enabled = True
+    for chunk in chunks:
+        total += chunk.all
+        enabled_total += chunk.enabled + (chunk.leading if enabled else 0)
+        if chunk.ends_enabled is not None:
+            enabled = chunk.ends_enabled
+    return Totals(total, enabled_total)
+
+
+def scan(buffer: InputBuffer) -> Totals:
+    """
+    Sum the multiplications in a memory dump in a single pass, tracking
+    whether they're enabled as `do()` and `don't()` are seen. The buffer
+    is scanned in place, so this works over a memory-mapped input.
+
+    """
+    return combine([scan_range(buffer.buffer, 0, len(buffer))])
+
+
+def _scan_file_range(input_path: Path, start: int, end: int) -> ChunkTotals:
+    """Open an input in a worker and scan a range of it."""
+    with open_input(input_path) as buffer:
+        return scan_range(buffer.buffer, start, end)
+
+
+def scan_parallel(input_path: Path, buffer: InputBuffer) -> Totals:
+    """
+    Sum the multiplications in a memory dump by scanning chunks of it in
+    worker processes, each of which maps the input itself. Inputs from
+    stdin can't be reopened, so are scanned in this process.
+
+    """
+    # Imported here so the default engine doesn't pay for the process pool's imports.
+    from concurrent.futures import ProcessPoolExecutor  # noqa: PLC0415
+
+    if input_path == STDIN:
+        return scan(buffer)
+
+    size = len(buffer)
+    n_chunks = PARALLEL_CHUNKS_PER_WORKER * (os.process_cpu_count() or 1)
+    chunk_size = max(MIN_PARALLEL_CHUNK_SIZE, -(-size // n_chunks))
+    starts = range(0, size, chunk_size)
+    ends = [min(start + chunk_size, size) for start in starts]
+    with ProcessPoolExecutor() as pool:
+        return combine(pool.map(_scan_file_range, repeat(input_path), starts, ends))
+
+
+def input_file(part: PartName, *, test: bool = False, input_path: Path | None = None) -> Path:
+    """Get the path to the input, as each part has its own test input."""
+    test_name = f"test_part_{part}.txt"
+    return input_path or package_input(__file__, test=test, test_name=test_name)
+
+
+def scan_serial(input_path: Path, buffer: InputBuffer) -> Totals:  # noqa: ARG001
+    """Sum the multiplications in a memory dump in this process, given where it was opened."""
+    return scan(buffer)
+
+
+def part_one(totals: Totals) -> int:
     """Perform part one of the Advent of Code solution."""
-    total = eval_matches(instructions)
-    print(f"Part one: {total} sum of multiplications")
+    return totals.all
 
 
-def part_two(instructions: Instructions) -> None:
+def part_two(totals: Totals) -> int:
     """Perform part two of the Advent of Code solution."""
-    pattern = re.compile(r"(don't\(\)(.+?))(do(n't)?\(\)|$)", re.DOTALL)
-    while match := pattern.search(instructions):
-        start, end = match.span(1)
-        instructions = instructions[:start] + instructions[end:]
-
-    total = eval_matches(instructions)
-    print(f"Part two: {total} sum of multiplications")
-
-
-def run(part: Part, *, test: bool = False) -> None:
+    return totals.enabled
+
+
+def generate(file: TextIO, size: int, rng: "Random") -> None:
+    """Generate roughly `size` characters of corrupted memory."""
+    noise = "!@#$%^&*()[]{}<>,'?/+-_ :;~0123456789abdehilmnortuwy"
+
+    def generate_fragment() -> str:
+        roll = rng.random()
+        a, b = rng.randint(1, 999), rng.randint(1, 999)
+        if roll < 0.1:  # noqa: PLR2004
+            return f"mul({a},{b})"
+        if roll < 0.15:  # noqa: PLR2004
+            return rng.choice((f"mul({a}, {b})", f"mul[{a},{b}]", f"mul({a},{b}", "mul(,)"))
+        if roll < 0.18:  # noqa: PLR2004
+            return rng.choice(("do()", "don't()", "do(", "don't"))
+        return "".join(rng.choices(noise, k=rng.randint(1, 8)))
+
+    def generate_line(length: int) -> str:
+        fragments = []
+        line_length = 0
+        while line_length < length:
+            fragment = generate_fragment()
+            fragments.append(fragment)
+            line_length += len(fragment)
+        return "".join(fragments)
+
+    max_line_length = 3000
+    lengths = (min(max_line_length, size - start) for start in range(0, size, max_line_length))
+    write_lines(file, map(generate_line, lengths))
+
+
+ENGINES: dict[str, Callable[[Path, InputBuffer], Totals]] = {
+    "python": scan_serial,
+    "parallel": scan_parallel,
+}
+"""The engines which can be selected to scan the input, given where it was opened."""
+
+
+def run(part: Part, *, test: bool = False, input_path: Path | None = None) -> list[Result]:
     """Run the solution to the third Advent of Code problem."""
+    scan_input = select_engine(ENGINES)
+    parts: tuple[PartName, ...] = ("one", "two") if part == "both" else (part,)
+    paths = {name: input_file(name, test=test, input_path=input_path) for name in parts}
+    # Both parts come from one scan of the input, unless they have their own test inputs.
+    with ExitStack() as stack:
+        with span("load"):
+            buffers = {path: stack.enter_context(open_input(path)) for path in paths.values()}
+        with span("scan"):
+            totals = {path: scan_input(path, buffer) for path, buffer in buffers.items()}
+
+    results: list[Result] = []
     if part in ("one", "both"):
-        instructions = load_input("one", test=test)
-        part_one(instructions)
+        totals_one = totals[paths["one"]]
+        results.append(solve(3, "one", "{answer} sum of multiplications", part_one, totals_one))
 
     if part in ("two", "both"):
-        instructions = load_input("two", test=test)
-        part_two(instructions)
+        totals_two = totals[paths["two"]]
+        results.append(solve(3, "two", "{answer} sum of multiplications", part_two, totals_two))
+
+    return results
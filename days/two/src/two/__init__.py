@@ -1,13 +1,31 @@
 """The day two solution to Advent of Code."""
 
+import sys
+from array import array
+from collections.abc import Callable
+from itertools import pairwise, repeat
 from pathlib import Path
+from typing import TYPE_CHECKING, Any, NamedTuple, TextIO
 
-from aoc_core import Part, pairwise
+from aoc_core import (
+    INT_TYPECODE,
+    Codec,
+    InputBuffer,
+    Part,
+    Result,
+    differences,
+    load_cached,
+    pack_ragged,
+    package_input,
+    select_engine,
+    solve,
+    span,
+    unpack_ragged,
+    write_lines,
+)
 
-ROOT = Path(__file__).resolve().parent
-DATA_ROOT = ROOT.joinpath("data")
-LIVE_INPUT = DATA_ROOT.joinpath("live.txt")
-TEST_INPUT = DATA_ROOT.joinpath("test.txt")
+if TYPE_CHECKING:
+    from random import Random
 
 type Level = int
 type Report = list[Level]
@@ -18,55 +36,252 @@ MIN_SAFE_THRESHOLD: Level = 1
 MAX_SAFE_THRESHOLD: Level = 3
 SAFE_RANGE = range(MIN_SAFE_THRESHOLD, MAX_SAFE_THRESHOLD + 1)
 
+UNSAFE, INCREASING, DECREASING, BOUNDARY = range(4)
+"""The classes of the differences between levels, for the batch engine."""
+LOW_BYTE_CLASSES = bytes(
+    INCREASING if byte in SAFE_RANGE else DECREASING if 0x100 - byte in SAFE_RANGE else UNSAFE
+    for byte in range(0x100)
+)
+"""The class of each low byte of a 16-bit difference, ignoring its high byte."""
+HIGH_BYTE_CLASSES = bytes((INCREASING, *repeat(UNSAFE, 0xFE), DECREASING))
+"""The class of each high byte of a 16-bit difference, masking the class of its low byte."""
+FIFTEEN_BIT_HIGH_BYTES = bytes((*range(0x40), *range(0xC0, 0x100)))
+"""The second-lowest bytes of the integers which fit in 15 bits."""
+SIGN_EXTENSION = bytes((0x00,) * 0x80 + (0xFF,) * 0x80)
+"""The higher bytes of an integer which fits in 16 bits, by its second-lowest byte."""
+CLAMPED_DIFFS = range(-MAX_SAFE_THRESHOLD - 1, MAX_SAFE_THRESHOLD + 2)
+"""The differences between levels, clamped to one past the safe thresholds."""
+DIFF_CLASSES = bytes(
+    INCREASING if diff in SAFE_RANGE else DECREASING if -diff in SAFE_RANGE else UNSAFE
+    for diff in sorted(CLAMPED_DIFFS, key=lambda diff: diff < 0)
+)
+"""The class of each clamped difference, indexed by it, so negative ones index from the end."""
 
-def load_input(*, test: bool = False) -> Reports:
+
+def parse_input(buffer: InputBuffer) -> Reports:
+    """Parse the input."""
+    return [list(map(int, line.split())) for line in buffer.lines()]
+
+
+CODEC: Codec[Reports] = Codec(encode=pack_ragged, decode=unpack_ragged)
+"""How the parsed input is stored in the cache."""
+
+
+def load_input(*, test: bool = False, input_path: Path | None = None) -> Reports:
     """Load the input."""
-    input_path = TEST_INPUT if test else LIVE_INPUT
+    input_path = input_path or package_input(__file__, test=test)
+    return load_cached(input_path, "two", parse_input, CODEC)
+
+
+class PackedReports(NamedTuple):
+    """Every report's levels in one flat array, and the offsets each report starts and ends at."""
+
+    levels: array[int]
+    offsets: array[int]
+
+
+def parse_packed(buffer: InputBuffer) -> PackedReports:
+    """Parse the input into a packed array of reports."""
+    levels, offsets = array(INT_TYPECODE), array(INT_TYPECODE, [0])
+    for line in buffer.lines():
+        levels.extend(map(int, line.split()))
+        offsets.append(len(levels))
+    return PackedReports(levels, offsets)
+
 
-    with input_path.open("r", encoding="utf-8") as file:
-        lines = filter(None, map(str.strip, file))
-        return [list(map(int, line.split())) for line in lines]
+PACKED_CODEC: Codec[PackedReports] = Codec(
+    encode=lambda reports: (reports.levels.tobytes(), reports.offsets.tobytes()),
+    decode=lambda data: PackedReports(array(INT_TYPECODE, data[0]), array(INT_TYPECODE, data[1])),
+)
+"""How the batch engine's parsed input is stored in the cache, sharing entries with `CODEC`."""
+
+
+def load_packed(*, test: bool = False, input_path: Path | None = None) -> PackedReports:
+    """Load the input into a packed array of reports."""
+    input_path = input_path or package_input(__file__, test=test)
+    return load_cached(input_path, "two", parse_packed, PACKED_CODEC)
 
 
 def check_report_safe(report: Report) -> bool:
     """Return whether a report is safe."""
-    n_transitions = len(report) - 1
-    diffs = (next_ - current for current, next_ in pairwise(report))
-    sign_safe = ((-1 if diff < 0 else 1, abs(diff) in SAFE_RANGE) for diff in diffs)
-    n_safe_transitions = abs(sum(sign if safe else 0 for sign, safe in sign_safe))
-    return n_safe_transitions == n_transitions
+    diffs = differences(report)
+    if not diffs:
+        return True
+    lowest, highest = min(diffs), max(diffs)
+    increasing_safely = lowest in SAFE_RANGE and highest in SAFE_RANGE
+    return increasing_safely or (-highest in SAFE_RANGE and -lowest in SAFE_RANGE)
 
 
-def check_report_safe_with_skips(report: Report) -> bool:
-    """Return whether a report is safe, allowing a single skipped value."""
+def check_report_safe_with_skips(report: Report, skips: int = 1) -> bool:
+    """
+    Return whether a report is safe, allowing up to `skips` skipped values.
+
+    This takes one pass over the report for each direction, tracking the
+    fewest values which must be skipped for each value to end a safe run.
+    A value can only follow one of the `skips + 1` values before it, so the
+    check is linear in the length of the report, and nothing is copied.
+
+    """
     if check_report_safe(report):
         return True
 
-    for skip_index in range(len(report)):
-        new_report = report[:skip_index] + report[skip_index + 1 :]
-        if check_report_safe(new_report):
-            return True
+    n_levels = len(report)
+    for sign in (1, -1):
+        fewest_skips: list[int] = []
+        for index, level in enumerate(report):
+            fewest = index  # Skip every value before this one.
+            for previous in range(max(0, index - skips - 1), index):
+                if sign * (level - report[previous]) in SAFE_RANGE:
+                    fewest = min(fewest, fewest_skips[previous] + (index - previous - 1))
+            if fewest + (n_levels - 1 - index) <= skips:  # Skip every value after this one.
+                return True
+            fewest_skips.append(fewest)
     return False
 
 
-def part_one(reports: Reports) -> None:
+def _classify_small_differences(levels: array[int]) -> bytes | None:
+    """
+    Class the difference between each level and the next, without a loop
+    in Python, if every level fits in 15 bits.
+
+    The low 16 bits of every level are packed into 24-bit lanes of two big
+    integers, one offset by a level from the other, and subtracted at once.
+    Each lane is biased by 2**16 so no lane borrows from the next, and its
+    low 16 bits are the difference, as differences of 15-bit levels can't
+    overflow. Each byte of the differences is then classed by a table, and
+    the two classes masked with each other.
+
+    """
+    raw, itemsize = levels.tobytes(), levels.itemsize
+    low_index, high_index = (0, 1) if sys.byteorder == "little" else (itemsize - 1, itemsize - 2)
+    low, high = raw[low_index::itemsize], raw[high_index::itemsize]
+    sign = high.translate(SIGN_EXTENSION)
+    if high.translate(None, FIFTEEN_BIT_HIGH_BYTES) or any(
+        raw[index::itemsize] != sign
+        for index in range(itemsize)
+        if index not in (low_index, high_index)
+    ):
+        return None
+
+    n_differences = len(low) - 1
+    if n_differences < 1:
+        return b""
+
+    def pack_lanes(low: bytes, high: bytes) -> int:
+        lanes = bytearray(3 * n_differences)
+        lanes[1::3] = high
+        lanes[2::3] = low
+        return int.from_bytes(lanes)
+
+    bias = int.from_bytes(b"\x01\x00\x00" * n_differences)
+    lanes = pack_lanes(low[1:], high[1:]) + bias - pack_lanes(low[:-1], high[:-1])
+    diffs = lanes.to_bytes(3 * n_differences)
+    low_classes = int.from_bytes(diffs[2::3].translate(LOW_BYTE_CLASSES))
+    high_classes = int.from_bytes(diffs[1::3].translate(HIGH_BYTE_CLASSES))
+    return (low_classes & high_classes).to_bytes(n_differences)
+
+
+def _classify_differences(levels: array[int]) -> bytes:
+    """Class the difference between each level and the next, clamping the differences."""
+    lower, upper = CLAMPED_DIFFS[0], CLAMPED_DIFFS[-1]
+    clamped = map(min, map(max, differences(levels), repeat(lower)), repeat(upper))
+    return bytes(map(DIFF_CLASSES.__getitem__, clamped))
+
+
+def check_reports_safe(reports: PackedReports) -> list[bool]:
+    """
+    Return whether each report is safe, checking every report at once.
+
+    The differences between all the levels are classed as increasing,
+    decreasing or unsafe in bulk. The differences which cross from one
+    report to the next are marked as boundaries, so a report is safe if
+    the run of classes between its boundaries is all increasing or all
+    decreasing.
+
+    """
+    if len(reports.offsets) == 1:
+        return []
+    small_classes = _classify_small_differences(reports.levels)
+    if small_classes is None:
+        classes = bytearray(_classify_differences(reports.levels))
+    else:
+        classes = bytearray(small_classes)
+    for end in reports.offsets[1:-1]:
+        classes[end - 1] = BOUNDARY
+    return [
+        not run.strip(bytes((INCREASING,))) or not run.strip(bytes((DECREASING,)))
+        for run in classes.split(bytes((BOUNDARY,)))
+    ]
+
+
+def part_one(reports: Reports) -> int:
     """Perform part one of the Advent of Code solution."""
-    safe_count = sum(map(check_report_safe, reports))
-    print(f"Part one: {safe_count} reports are safe")
+    return sum(map(check_report_safe, reports))
 
 
-def part_two(reports: Reports) -> None:
+def part_two(reports: Reports) -> int:
     """Perform part two of the Advent of Code solution."""
-    safe_count = sum(map(check_report_safe_with_skips, reports))
-    print(f"Part two: {safe_count} reports are safe")
+    return sum(map(check_report_safe_with_skips, reports))
+
+
+def part_one_batch(reports: PackedReports) -> int:
+    """Perform part one of the Advent of Code solution, checking every report at once."""
+    return sum(check_reports_safe(reports))
+
+
+def part_two_batch(reports: PackedReports) -> int:
+    """Perform part two of the Advent of Code solution, only skipping values in unsafe reports."""
+    levels = reports.levels
+    return sum(
+        safe or check_report_safe_with_skips(levels[start:end].tolist())
+        for safe, (start, end) in zip(
+            check_reports_safe(reports), pairwise(reports.offsets), strict=True
+        )
+    )
 
 
-def run(part: Part, *, test: bool = False) -> None:
+def generate(file: TextIO, size: int, rng: "Random") -> None:
+    """Generate `size` reports, some of which have a bad level."""
+
+    def generate_report() -> str:
+        sign = rng.choice((-1, 1))
+        levels = [rng.randint(10, 90)]
+        for _ in range(rng.randint(4, 7)):
+            levels.append(levels[-1] + (sign * rng.randint(MIN_SAFE_THRESHOLD, MAX_SAFE_THRESHOLD)))
+        if rng.random() < 0.5:  # noqa: PLR2004
+            bad_index = rng.randrange(len(levels))
+            levels[bad_index] += rng.choice((-5, -4, 0, 4, 5))
+        return " ".join(map(str, levels))
+
+    write_lines(file, (generate_report() for _ in range(size)))
+
+
+class Engine[T](NamedTuple):
+    """A way of loading and solving the input."""
+
+    load: Callable[..., T]
+    part_one: Callable[[T], int]
+    part_two: Callable[[T], int]
+
+
+ENGINES: dict[str, Engine[Any]] = {
+    "python": Engine(load_input, part_one, part_two),
+    "batch": Engine(load_packed, part_one_batch, part_two_batch),
+}
+"""The engines which can be selected to solve the problem."""
+
+
+def run(part: Part, *, test: bool = False, input_path: Path | None = None) -> list[Result]:
     """Run the solution to the second Advent of Code problem."""
-    reports = load_input(test=test)
+    engine = select_engine(ENGINES)
+    with span("load"):
+        reports = engine.load(test=test, input_path=input_path)
 
+    results: list[Result] = []
     if part in ("one", "both"):
-        part_one(reports)
+        results.append(solve(2, "one", "{answer} reports are safe", engine.part_one, reports))
 
     if part in ("two", "both"):
-        part_two(reports)
+        results.append(solve(2, "two", "{answer} reports are safe", engine.part_two, reports))
+
+    return results
@@ -1,52 +1,143 @@
 """The CLI for the Advent of Code runner."""
 
-import sys  # noqa: I001
+import sys
 from argparse import ArgumentParser, Namespace
+from collections.abc import Iterable, Iterator
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from pathlib import Path
+from typing import Literal
 
-# fmt: off
-import one
-import two
-import three
-import four
-import five
-import six
-import seven
-import eight
-import nine
-# fmt: on
-from aoc_core import Day, Part, Runner
+from aoc_core import (
+    DEFAULT_ENGINE,
+    DEFAULT_SEED,
+    Day,
+    DayNotFoundError,
+    ParseCache,
+    Part,
+    Result,
+    Runner,
+    available_days,
+    available_engines,
+    generate_input,
+    load_runner,
+    profile_imports,
+    record,
+    use_cache,
+    use_engine,
+)
 from pydantic import TypeAdapter
 
 
-class _RunnerArgs(Namespace):
+class _InputArgs(Namespace):
+    """The arguments which choose the input and how it's loaded."""
+
+    test: bool
+    input: Path | None
+    cache: bool
+    cache_dir: Path | None
+    engine: str
+
+
+class _RunnerArgs(_InputArgs):
     """The arguments from the parser."""
 
-    day: Day
+    days: list[Day]
     part: Part
-    test: bool
+    jobs: int | None
+    profile_import: bool
+    trace_memory: bool
+    profile: Path | None
+
+
+class _BenchArgs(_InputArgs):
+    """The arguments from the benchmark parser."""
+
+    days: list[Day]
+    part: Part
+    repeat: int
+    warmup: int
+    format: Literal["table", "json"]
+
+
+class _GenerateArgs(Namespace):
+    """The arguments from the input generator parser."""
+
+    day: Day
+    size: int
+    seed: int
+    output: Path | None
+
+
+def _add_input_arguments(parser: ArgumentParser) -> None:
+    """Add the arguments which choose the input and how it's loaded."""
+    parser.add_argument("-t", "--test", help="Use the test data", action="store_true")
+    parser.add_argument(
+        "-i", "--input", type=Path, help="The path to an input to use instead, or - for stdin"
+    )
+    parser.add_argument(
+        "-c", "--cache", help="Cache parsed inputs to skip parsing them again", action="store_true"
+    )
+    parser.add_argument(
+        "--cache-dir", type=Path, help="The directory to cache parsed inputs in (implies --cache)"
+    )
+    parser.add_argument(
+        "-e",
+        "--engine",
+        default=DEFAULT_ENGINE,
+        help=(
+            "The engine to use, for days which have it; other days use the default "
+            f"(default: {DEFAULT_ENGINE})"
+        ),
+    )
+
+
+def _check_engine(parser: ArgumentParser, engine: str, days: Iterable[Day]) -> None:
+    """Report a usage error if none of the days have the engine, importing their runners."""
+    if engine == DEFAULT_ENGINE:
+        return
+    engines = available_engines(set(days).intersection(available_days()))
+    if engine not in engines:
+        available = ", ".join(sorted({DEFAULT_ENGINE, *engines}))
+        parser.error(f"no {engine} engine for the days run, only: {available}")
+
+
+def _use_cache(args: _InputArgs) -> AbstractContextManager[ParseCache | None]:
+    """Use a parsed input cache, if the arguments ask for one."""
+    if args.cache or args.cache_dir is not None:
+        return use_cache(ParseCache(args.cache_dir))
+    return nullcontext()
 
 
-_RUNNERS: dict[Day, Runner] = {
-    1: one.run,
-    2: two.run,
-    3: three.run,
-    4: four.run,
-    5: five.run,
-    6: six.run,
-    7: seven.run,
-    8: eight.run,
-    9: nine.run,
-}
-"""Runners for Advent of Code days."""
+def _parse_days(spec: str) -> list[Day]:
+    """Parse a day, a range of days like 1-9, a comma-separated list of these, or all."""
+    if spec == "all":
+        days = available_days()
+    else:
+        validate_day = TypeAdapter(Day).validate_python
+        days = []
+        for item in spec.split(","):
+            first, _, last = item.partition("-")
+            start, stop = validate_day(first), validate_day(last or first)
+            if stop < start:
+                raise ValueError(f"The range {item} ends before it starts")
+            days.extend(range(start, stop + 1))
+    if not days:
+        raise ValueError("There are no days to run")
+    return list(dict.fromkeys(days))
 
 
-def _parse_args(argv: list[str]) -> _RunnerArgs:
-    """Build a parser and parse command line arguments."""
+def _parse_args(argv: list[str]) -> tuple[ArgumentParser, _RunnerArgs]:
+    """
+    Build a parser and parse command line arguments. The parser is
+    returned too, so the engine can be checked once a single day's runner
+    is imported, without the check's import skewing `--profile-import`.
+
+    """
     parser = ArgumentParser()
     parser.add_argument(
-        "day",
-        type=TypeAdapter(Day).validate_python,
-        help="The day to run the AoC submission for",
+        "days",
+        type=_parse_days,
+        help="The day to run the AoC submission for, a range like 1-9, or all",
     )
     parser.add_argument(
         "-p",
@@ -55,19 +146,229 @@ def _parse_args(argv: list[str]) -> _RunnerArgs:
         help="The part of the challenge to run",
         default="both",
     )
-    parser.add_argument("-t", "--test", help="Use the test data", action="store_true")
-    return parser.parse_args(argv, _RunnerArgs())
+    _add_input_arguments(parser)
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        help="The number of processes to run several days with (default: one per CPU)",
+    )
+    parser.add_argument(
+        "--profile-import",
+        help="Report the time taken to import each module of the day's solution",
+        action="store_true",
+    )
+    parser.add_argument(
+        "--trace-memory",
+        help="Trace memory allocations and report the time and peak memory of each part",
+        action="store_true",
+    )
+    parser.add_argument(
+        "--profile",
+        type=Path,
+        nargs="?",
+        const=Path(),
+        metavar="DIR",
+        help=(
+            "Report the time taken by each phase, and write cProfile stats and sampled stacks "
+            "for flamegraphs to a directory (default: the current directory)"
+        ),
+    )
+    args = parser.parse_args(argv, _RunnerArgs())
+    if len(args.days) > 1:
+        for option, given in (
+            ("--input", args.input is not None),
+            ("--profile-import", args.profile_import),
+            ("--trace-memory", args.trace_memory),
+            ("--profile", args.profile is not None),
+        ):
+            if given:
+                parser.error(f"{option} can only be used when running a single day")
+        _check_engine(parser, args.engine, args.days)
+    return parser, args
+
+
+def _parse_bench_args(argv: list[str]) -> _BenchArgs:
+    """Build a parser and parse command line arguments for benchmarking."""
+    parser = ArgumentParser(prog="aoc bench")
+    parser.add_argument(
+        "days",
+        type=TypeAdapter(Day).validate_python,
+        nargs="*",
+        help="The days to benchmark (default: all available days)",
+    )
+    parser.add_argument(
+        "-p",
+        "--part",
+        type=TypeAdapter(Part).validate_python,
+        help="The part of the challenge to benchmark",
+        default="both",
+    )
+    _add_input_arguments(parser)
+    parser.add_argument(
+        "-n", "--repeat", type=int, default=5, help="The number of timed runs of each day"
+    )
+    parser.add_argument(
+        "-w", "--warmup", type=int, default=1, help="The number of untimed runs before timing"
+    )
+    parser.add_argument(
+        "-f",
+        "--format",
+        choices=("table", "json"),
+        default="table",
+        help="The format to report the results in",
+    )
+    args = parser.parse_args(argv, _BenchArgs())
+    _check_engine(parser, args.engine, args.days or available_days())
+    return args
+
+
+def bench(argv: list[str]) -> None:
+    """Benchmark Advent of Code entries using provided CLI args."""
+    # Imported here so running a single day doesn't pay for the benchmark's imports.
+    from aoc_core.bench import benchmark, write_json, write_table  # noqa: PLC0415
+
+    args = _parse_bench_args(argv)
+    with _use_cache(args), use_engine(args.engine):
+        stats = [
+            stat
+            for day in args.days or available_days()
+            for stat in benchmark(
+                day,
+                args.part,
+                repeat=args.repeat,
+                warmup=args.warmup,
+                test=args.test,
+                input_path=args.input,
+            )
+        ]
+    if args.format == "json":
+        write_json(stats)
+    else:
+        write_table(stats)
+
+
+def _parse_generate_args(argv: list[str]) -> _GenerateArgs:
+    """Build a parser and parse command line arguments for generating inputs."""
+    parser = ArgumentParser(prog="aoc generate")
+    parser.add_argument(
+        "day",
+        type=TypeAdapter(Day).validate_python,
+        help="The day to generate an input for",
+    )
+    parser.add_argument("size", type=int, help="The size of the input, which varies by day")
+    parser.add_argument(
+        "-s", "--seed", type=int, default=DEFAULT_SEED, help="The seed for the generator"
+    )
+    parser.add_argument(
+        "-o", "--output", type=Path, help="The path to write the input to (default: stdout)"
+    )
+    return parser.parse_args(argv, _GenerateArgs())
+
+
+def generate(argv: list[str]) -> None:
+    """Generate a synthetic input for an Advent of Code entry using provided CLI args."""
+    args = _parse_generate_args(argv)
+    if args.output is None:
+        generate_input(args.day, args.size, sys.stdout, seed=args.seed)
+        return
+
+    with args.output.open("w", encoding="utf-8") as file:
+        generate_input(args.day, args.size, file, seed=args.seed)
+
+
+def _print_result(result: Result, *, show_day: bool = False) -> None:
+    """Print the result of a part, with its time and peak memory if they were traced."""
+    line = f"Day {result.day}, {result}" if show_day else str(result)
+    if result.peak_memory is not None:
+        elapsed_ms = result.elapsed * 1000
+        peak_kib = result.peak_memory / 1024
+        line = f"{line} ({elapsed_ms:.1f} ms, {peak_kib:.1f} KiB peak)"
+    print(line)
+
+
+@contextmanager
+def _profile(day: Day, directory: Path) -> Iterator[None]:
+    """
+    Profile the code run within the context with `cProfile`, while
+    sampling stacks and recording spans. The stats and sampled stacks are
+    written to the directory, and a summary of both is printed to stderr.
+
+    """
+    # Imported here so running a day without profiling doesn't pay for the profilers' imports.
+    import cProfile  # noqa: PLC0415
+    import pstats  # noqa: PLC0415
+
+    from aoc_core.flamegraph import StackSampler  # noqa: PLC0415
+
+    with cProfile.Profile() as profiler, StackSampler() as sampler, record() as recorder:
+        yield
+
+    directory.mkdir(parents=True, exist_ok=True)
+    stats_path = directory.joinpath(f"day-{day}.prof")
+    profiler.dump_stats(stats_path)
+    stacks_path = directory.joinpath(f"day-{day}.collapsed")
+    with stacks_path.open("w", encoding="utf-8") as file:
+        sampler.write_collapsed(file)
+
+    pstats.Stats(profiler, stream=sys.stderr).sort_stats("cumulative").print_stats(20)
+    recorder.report()
+    print(f"Wrote {stats_path} and {stacks_path}", file=sys.stderr)
+
+
+def run_many(args: _RunnerArgs) -> None:
+    """Run several Advent of Code entries concurrently, printing results in order."""
+    # Imported here so running a single day doesn't pay for the process pool's imports.
+    from aoc_core.batch import run_days  # noqa: PLC0415
+
+    if missing := sorted(set(args.days).difference(available_days())):
+        raise NotImplementedError(f"{', '.join(map(str, missing))} not implemented yet")
+
+    cache = ParseCache(args.cache_dir) if args.cache or args.cache_dir is not None else None
+    for result in run_days(
+        args.days,
+        args.part,
+        test=args.test,
+        cache=cache,
+        engine=args.engine,
+        max_workers=args.jobs,
+    ):
+        _print_result(result, show_day=True)
 
 
 def main(argv: list[str]) -> None:
     """Run an Advent of Code entry using provided CLI args."""
-    args = _parse_args(argv)
-    try:
-        runner = _RUNNERS[args.day]
-    except KeyError as err:
-        raise NotImplementedError(f"{args.day} is not implemented yet") from err
+    if argv[:1] == ["bench"]:
+        return bench(argv[1:])
+    if argv[:1] == ["generate"]:
+        return generate(argv[1:])
+
+    parser, args = _parse_args(argv)
+    if len(args.days) > 1:
+        return run_many(args)
+    (day,) = args.days
+
+    with profile_imports() if args.profile_import else nullcontext() as profiler:
+        try:
+            runner: Runner = load_runner(day)
+        except DayNotFoundError as err:
+            raise NotImplementedError(str(err)) from err
+    if profiler is not None:
+        profiler.report()
+    _check_engine(parser, args.engine, args.days)
+
+    if args.trace_memory:
+        # Imported here so running a day without tracing doesn't pay for the import.
+        import tracemalloc  # noqa: PLC0415
+
+        tracemalloc.start()
+    profiling = nullcontext() if args.profile is None else _profile(day, args.profile)
+    with _use_cache(args), use_engine(args.engine), profiling:
+        results = runner(args.part, test=args.test, input_path=args.input)
 
-    runner(args.part, test=args.test)
+    for result in results:
+        _print_result(result)
+    return None
 
 
 def run() -> None:
@@ -0,0 +1,49 @@
+"""Checks of day seven's backwards solving against evaluating every combination of operators."""
+
+from operator import add, mul
+from random import Random
+
+import pytest
+from seven import (
+    INVERSES,
+    CalibrationNumbers,
+    Operator,
+    TestValue,
+    concat,
+    evaluate_forwards,
+    solve_backwards,
+)
+
+N_CALIBRATIONS = 2000
+"""The number of random calibrations to check."""
+OPERATOR_SETS: tuple[tuple[Operator, ...], ...] = ((add, mul), (add, mul, concat))
+"""The operators of each part."""
+
+
+def random_calibration(
+    rng: Random, operators: tuple[Operator, ...]
+) -> tuple[TestValue, CalibrationNumbers]:
+    """
+    Make a random calibration of positive numbers. Most test values are
+    made by applying random operators, so they can be made true, and the
+    rest are nudged away from one.
+
+    """
+    numbers = [rng.randint(1, 20) for _ in range(rng.randint(1, 6))]
+    value = numbers[0]
+    for number in numbers[1:]:
+        value = rng.choice(operators)(value, number)
+    if rng.random() < 1 / 3:
+        value = max(1, value + rng.randint(-3, 3))
+    return value, numbers
+
+
+@pytest.mark.parametrize("seed", range(N_CALIBRATIONS))
+@pytest.mark.parametrize("operators", OPERATOR_SETS)
+def test_solve_backwards(seed: int, operators: tuple[Operator, ...]) -> None:
+    """Solving a calibration backwards agrees with evaluating it forwards."""
+    test_value, numbers = random_calibration(Random(seed), operators)  # noqa: S311
+    inverses = [INVERSES[operator] for operator in operators]
+    assert solve_backwards(test_value, numbers, inverses) == evaluate_forwards(
+        test_value, numbers, operators
+    )
@@ -0,0 +1,114 @@
+"""Checks of day six's loop detection against walking the guard a step at a time."""
+
+from random import Random
+
+import pytest
+from aoc_core import Grid
+from six import (
+    DIRECTION_NAMES,
+    EXIT,
+    N_DIRECTIONS,
+    OBSTACLE,
+    OFFSETS,
+    Guard,
+    JumpTable,
+    Position,
+    part_two,
+)
+
+N_MAPS = 2000
+"""The number of random maps to check."""
+
+
+def walk_will_loop(grid: Grid, guard: Guard) -> bool:
+    """Check whether a guard's patrol loops, walking it a step at a time."""
+    x, y, direction = guard.position.x, guard.position.y, DIRECTION_NAMES.index(guard.direction)
+    seen = set()
+    while (x, y, direction) not in seen:
+        seen.add((x, y, direction))
+        dx, dy = OFFSETS[direction]
+        if not grid.in_bounds(x + dx, y + dy):
+            return False
+        if grid[grid.index(x + dx, y + dy)] == OBSTACLE:
+            direction = (direction + 1) % N_DIRECTIONS
+        else:
+            x, y = x + dx, y + dy
+    return True
+
+
+def walk_to_stop(grid: Grid, index: int, direction: int) -> int:
+    """Walk from a cell in a direction until the next step is off the grid or an obstacle."""
+    (x, y), (dx, dy) = grid.position(index), OFFSETS[direction]
+    while grid.in_bounds(x + dx, y + dy):
+        if grid[grid.index(x + dx, y + dy)] == OBSTACLE:
+            return grid.index(x, y)
+        x, y = x + dx, y + dy
+    return EXIT
+
+
+def random_map(rng: Random) -> tuple[Grid, Guard]:
+    """Make a small random map, with a guard whose patrol leaves it."""
+    while True:
+        width, height = rng.randint(1, 10), rng.randint(1, 10)
+        density = rng.uniform(0.05, 0.4)
+        cells = bytes(
+            OBSTACLE if rng.random() < density else ord(".") for _ in range(width * height)
+        )
+        grid = Grid(cells, width)
+        x, y = rng.randrange(width), rng.randrange(height)
+        grid = grid.with_cell(grid.index(x, y), ord("."))
+        guard = Guard(position=Position(x=x, y=y), direction=rng.choice(DIRECTION_NAMES))
+        if not walk_will_loop(grid, guard):
+            return Grid(grid.cells, width), guard
+
+
+def brute_force_loops(grid: Grid, guard: Guard) -> set[int]:
+    """Find the obstacles which make the patrol loop, by trying one at every free cell."""
+    start = grid.index(guard.position.x, guard.position.y)
+    return {
+        index
+        for index in range(len(grid))
+        if index != start
+        and grid[index] != OBSTACLE
+        and walk_will_loop(grid.with_cell(index, OBSTACLE), guard)
+    }
+
+
+@pytest.mark.parametrize("seed", range(N_MAPS))
+def test_jump_table_stops(seed: int) -> None:
+    """Each stop, with and without an added obstacle, is where walking stops."""
+    rng = Random(seed)  # noqa: S311
+    grid, _ = random_map(rng)
+    free_cells = [index for index in range(len(grid)) if grid[index] != OBSTACLE]
+    obstacle = rng.choice(free_cells)
+    with_obstacle = grid.with_cell(obstacle, OBSTACLE)
+    table = JumpTable.from_grid(grid)
+    for index in free_cells:
+        if index == obstacle:
+            continue
+        for direction in range(N_DIRECTIONS):
+            assert table.next_stop(index, direction) == walk_to_stop(grid, index, direction)
+            assert table.with_obstacle(obstacle).next_stop(index, direction) == walk_to_stop(
+                with_obstacle, index, direction
+            )
+
+
+@pytest.mark.parametrize("seed", range(N_MAPS))
+def test_resumed_loop_checks(seed: int) -> None:
+    """Resuming each loop check from just before its obstacle finds the same loops."""
+    grid, guard = random_map(Random(seed))  # noqa: S311
+    table = JumpTable.from_grid(grid)
+    route_turns = table.route_turns(guard.state(grid.width))
+    loops = {
+        obstacle
+        for obstacle, state, n_turns in guard.resume_points(grid)
+        if table.with_obstacle(obstacle).patrol_will_loop(state, route_turns, n_turns)
+    }
+    assert loops == brute_force_loops(grid, guard)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_part_two(seed: int) -> None:
+    """The loop checks give the same count when shared with worker processes."""
+    grid, guard = random_map(Random(seed))  # noqa: S311
+    assert part_two(grid, guard) == len(brute_force_loops(grid, guard))
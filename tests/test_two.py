@@ -0,0 +1,90 @@
+"""Checks of day two's report checks against slower, simpler ones."""
+
+from array import array
+from itertools import combinations
+from random import Random
+
+import pytest
+from aoc_core import INT_TYPECODE
+from two import (
+    PackedReports,
+    Report,
+    _classify_differences,
+    _classify_small_differences,
+    check_report_safe,
+    check_report_safe_with_skips,
+    check_reports_safe,
+)
+
+N_REPORTS = 2000
+"""The number of random reports to check."""
+FIFTEEN_BITS = range(-(1 << 14), 1 << 14)
+"""The levels which fit in 15 bits, which can be classed in lanes."""
+WIDE_CHANCE = 0.5
+"""The chance of a check using wide reports."""
+
+
+def random_report(rng: Random, *, wide: bool = False) -> Report:
+    """
+    Make a short random report, with steps often small enough to be safe.
+    Wide reports start anywhere near the edges of 15 and 16 bits, or far
+    beyond them.
+
+    """
+    level = rng.randint(1, 20)
+    if wide:
+        edge = rng.choice((1 << 14, 1 << 15, 1 << 16, 1 << 40))
+        level = rng.choice((1, -1)) * edge + rng.randint(-12, 12)
+    report = []
+    for _ in range(rng.randint(0, 9)):
+        report.append(level)
+        level += rng.choice((-5, -4, -3, -2, -1, 0, 1, 1, 2, 2, 3, 3, 4, 5))
+    return report
+
+
+def safe_with_skips_brute_force(report: Report, skips: int) -> bool:
+    """Check whether a report is safe, trying every way of skipping up to `skips` levels."""
+    return any(
+        check_report_safe([level for index, level in enumerate(report) if index not in skipped])
+        for n_skipped in range(skips + 1)
+        for skipped in map(set, combinations(range(len(report)), n_skipped))
+    )
+
+
+@pytest.mark.parametrize("seed", range(N_REPORTS))
+def test_safe_with_skips(seed: int) -> None:
+    """Checking a report with skips in one pass agrees with trying every skip."""
+    rng = Random(seed)  # noqa: S311
+    report = random_report(rng)
+    for skips in range(4):
+        assert check_report_safe_with_skips(report, skips) == safe_with_skips_brute_force(
+            report, skips
+        )
+
+
+@pytest.mark.parametrize("seed", range(N_REPORTS))
+def test_classify_small_differences(seed: int) -> None:
+    """Classing differences in lanes agrees with classing them one by one, if it can be done."""
+    rng = Random(seed)  # noqa: S311
+    levels = array(INT_TYPECODE, random_report(rng, wide=rng.random() < WIDE_CHANCE))
+    classes = _classify_small_differences(levels)
+    if all(level in FIFTEEN_BITS for level in levels):
+        assert classes == _classify_differences(levels)
+    else:
+        assert classes is None
+
+
+@pytest.mark.parametrize("seed", range(N_REPORTS // 10))
+def test_check_reports_safe(seed: int) -> None:
+    """Checking every report at once agrees with checking each report."""
+    rng = Random(seed)  # noqa: S311
+    wide = rng.random() < WIDE_CHANCE
+    reports = [random_report(rng, wide=wide and rng.random() < WIDE_CHANCE) for _ in range(20)]
+    reports = [report for report in reports if report]  # Parsing skips empty lines.
+    levels, offsets = array(INT_TYPECODE), array(INT_TYPECODE, [0])
+    for report in reports:
+        levels.extend(report)
+        offsets.append(len(levels))
+    assert check_reports_safe(PackedReports(levels, offsets)) == list(
+        map(check_report_safe, reports)
+    )